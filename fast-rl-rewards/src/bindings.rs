@@ -12,13 +12,21 @@
 //! - Dicts with "content" key: `[{"content": "code1"}, ...]`
 //! - Lists of dicts: `[[{"content": "code1"}], ...]`
 //!
+//! `execution_reward_dict_batch` instead takes whole dataset rows:
+//! `[{"completion": "code1", "test": "...", "entry_point": "f"}, ...]`
+//!
 //! This flexibility allows drop-in replacement in TRL, Ray RLlib, and custom workflows.
+//!
+//! Strings are not copied into Rust: the bindings hold references to the Python string
+//! objects and borrow their UTF-8 buffers for the duration of the call.
 
 use crate::evaluator::{EvaluatorConfig, RewardEvaluator};
+use crate::reward_mask::count_ones_in_bytes;
 use once_cell::sync::Lazy;
 use pyo3::exceptions::PyValueError;
 use pyo3::prelude::*;
-use pyo3::types::{PyDict, PyList};
+use pyo3::types::{PyBytes, PyDict, PyList, PyString};
+use std::borrow::Cow;
 
 // ==========================================================================================
 
@@ -47,6 +55,7 @@ static DEFAULT_EVALUATOR: Lazy<RewardEvaluator> = Lazy::new(|| {
 ///     memory_limit_mb = 1024,
 ///     cpu_time_limit = 15,
 ///     num_threads = None,
+///     persistent_workers = True,
 /// )
 ///
 /// format_scores = evaluator.format_reward(completions)
@@ -64,18 +73,20 @@ pub struct PyRewardEvaluator {
 #[pymethods]
 impl PyRewardEvaluator {
     #[new]
-    #[pyo3(signature = (timeout_seconds=15, memory_limit_mb=512, cpu_time_limit=12, num_threads=32))]
+    #[pyo3(signature = (timeout_seconds=15, memory_limit_mb=512, cpu_time_limit=12, num_threads=32, persistent_workers=false))]
     fn new(
         timeout_seconds: u64,
         memory_limit_mb: u64,
         cpu_time_limit: u64,
         num_threads: usize,
+        persistent_workers: bool,
     ) -> PyResult<Self> {
         let config = EvaluatorConfig {
             timeout_seconds,
             memory_limit_mb,
             cpu_time_limit,
             num_threads: Some(num_threads),
+            persistent_workers,
         };
 
         let evaluator = RewardEvaluator::new(config)
@@ -94,8 +105,10 @@ impl PyRewardEvaluator {
     /// # Returns
     /// List of floats (1.0 or 0.0)
     fn format_reward(&self, completions: &Bound<'_, PyList>) -> PyResult<Vec<f64>> {
-        let completions = extract_completions_from_pylist(completions)?;
-        Ok(self.evaluator.evaluate_response_format(&completions))
+        let completion_objs = extract_completions_from_pylist(completions)?;
+        Ok(self
+            .evaluator
+            .evaluate_response_format(&borrow_strs(&completion_objs)))
     }
 
     /// Evaluate execution rewards (runs code with tests).
@@ -117,19 +130,98 @@ impl PyRewardEvaluator {
         completions: &Bound<'_, PyList>,
         kwargs: Option<&Bound<'_, PyDict>>,
     ) -> PyResult<Vec<f64>> {
-        let completions = extract_completions_from_pylist(completions)?;
+        let columns = extract_kwarg_columns(py, completions, kwargs)?;
+        let (completions, tests, entry_points) = columns.borrow();
 
-        let (tests, entry_points) = if let Some(kwargs) = kwargs {
-            let tests = extract_string_list_from_kwargs(kwargs, "test", completions.len())?;
-            let entry_points =
-                extract_string_list_from_kwargs(kwargs, "entry_point", completions.len())?;
-            (tests, entry_points)
-        } else {
-            (
-                vec![String::new(); completions.len()],
-                vec![String::new(); completions.len()],
-            )
-        };
+        py.detach(|| {
+            Ok(self
+                .evaluator
+                .evaluate_execution_batch(&completions, &tests, &entry_points))
+        })
+    }
+
+    /// Evaluate execution rewards from an iterable of `(completion, test, entry_point)` tuples.
+    ///
+    /// Accepts any Python iterable (list, generator, prefetch queue, ...), so callers
+    /// streaming a dataset never need to build three parallel lists.
+    ///
+    /// # Arguments:
+    /// - `samples`: Iterable of `(completion, test, entry_point)` string tuples
+    ///
+    /// # Returns
+    /// List of floats (1.0 = all tests passed, 0.0 = failed/error)
+    fn execution_reward_stream(
+        &self,
+        py: Python,
+        samples: &Bound<'_, PyAny>,
+    ) -> PyResult<Vec<f64>> {
+        let columns = extract_samples_from_iterable(samples)?;
+        let (completions, tests, entry_points) = columns.borrow();
+
+        py.detach(|| {
+            Ok(self
+                .evaluator
+                .evaluate_execution_batch(&completions, &tests, &entry_points))
+        })
+    }
+
+    /// Evaluate execution rewards with interned tests and entry points.
+    ///
+    /// Each distinct test / entry point string crosses the Python -> Rust boundary once;
+    /// completions refer to them by index.
+    ///
+    /// # Arguments:
+    /// - `completions`: List of LLM outputs
+    /// - `unique_tests`: Distinct test code strings
+    /// - `test_ids`: Index into `unique_tests` for each completion
+    /// - `unique_entry_points`: Distinct entry points
+    /// - `entry_point_ids`: Index into `unique_entry_points` for each completion
+    ///
+    /// # Returns
+    /// List of floats (1.0 = all tests passed, 0.0 = failed/error)
+    fn execution_reward_interned(
+        &self,
+        py: Python,
+        completions: &Bound<'_, PyList>,
+        unique_tests: Vec<String>,
+        test_ids: Vec<u32>,
+        unique_entry_points: Vec<String>,
+        entry_point_ids: Vec<u32>,
+    ) -> PyResult<Vec<f64>> {
+        let completion_objs = extract_completions_from_pylist(completions)?;
+        let completions = borrow_strs(&completion_objs);
+        let tests = resolve_interned(&unique_tests, &test_ids, "test_ids", completions.len())?;
+        let entry_points = resolve_interned(
+            &unique_entry_points,
+            &entry_point_ids,
+            "entry_point_ids",
+            completions.len(),
+        )?;
+
+        py.detach(|| {
+            Ok(self
+                .evaluator
+                .evaluate_execution_batch(&completions, &tests, &entry_points))
+        })
+    }
+
+    /// Evaluate execution rewards from a list of sample dicts.
+    ///
+    /// Each row carries its own `completion` (or `content`), `test` and `entry_point`, so
+    /// dataset rows can be passed as-is instead of being split into three parallel lists.
+    ///
+    /// # Arguments:
+    /// - `samples`: List of dicts with `completion`/`content`, `test` and `entry_point`
+    ///
+    /// # Returns
+    /// List of floats (1.0 = all tests passed, 0.0 = failed/error)
+    fn execution_reward_dict_batch(
+        &self,
+        py: Python,
+        samples: &Bound<'_, PyList>,
+    ) -> PyResult<Vec<f64>> {
+        let columns = extract_rows_from_dicts(samples)?;
+        let (completions, tests, entry_points) = columns.borrow();
 
         py.detach(|| {
             Ok(self
@@ -137,6 +229,30 @@ impl PyRewardEvaluator {
                 .evaluate_execution_batch(&completions, &tests, &entry_points))
         })
     }
+
+    /// Evaluate execution rewards as a bit-packed pass/fail mask.
+    ///
+    /// Same inputs as `execution_reward`, but returns one bit per completion instead of one
+    /// float: bit `i % 8` of byte `i / 8` is set if completion `i` passed all tests.
+    ///
+    /// # Returns
+    /// `bytes` of length `ceil(len(completions) / 8)`; see `count_passed`
+    #[pyo3(signature = (completions, **kwargs))]
+    fn execution_reward_mask<'py>(
+        &self,
+        py: Python<'py>,
+        completions: &Bound<'py, PyList>,
+        kwargs: Option<&Bound<'py, PyDict>>,
+    ) -> PyResult<Bound<'py, PyBytes>> {
+        let columns = extract_kwarg_columns(py, completions, kwargs)?;
+        let (completions, tests, entry_points) = columns.borrow();
+
+        let mask = py.detach(|| {
+            self.evaluator
+                .evaluate_execution_mask(&completions, &tests, &entry_points)
+        });
+        Ok(PyBytes::new(py, &mask.to_le_bytes()))
+    }
 }
 
 // ==========================================================================================
@@ -154,8 +270,8 @@ impl PyRewardEvaluator {
 /// ```
 #[pyfunction]
 pub fn format_reward(completions: &Bound<'_, PyList>) -> PyResult<Vec<f64>> {
-    let completions = extract_completions_from_pylist(completions)?;
-    Ok(DEFAULT_EVALUATOR.evaluate_response_format(&completions))
+    let completion_objs = extract_completions_from_pylist(completions)?;
+    Ok(DEFAULT_EVALUATOR.evaluate_response_format(&borrow_strs(&completion_objs)))
 }
 
 /// Module-level function for execution reward (uses default evaluator).
@@ -176,25 +292,132 @@ pub fn execution_reward(
     completions: &Bound<'_, PyList>,
     kwargs: Option<&Bound<'_, PyDict>>,
 ) -> PyResult<Vec<f64>> {
-    let completions = extract_completions_from_pylist(completions)?;
+    let columns = extract_kwarg_columns(py, completions, kwargs)?;
+    let (completions, tests, entry_points) = columns.borrow();
 
-    let (tests, entry_points) = if let Some(kwargs) = kwargs {
-        let tests = extract_string_list_from_kwargs(kwargs, "test", completions.len())?;
-        let entry_points =
-            extract_string_list_from_kwargs(kwargs, "entry_point", completions.len())?;
-        (tests, entry_points)
-    } else {
-        (
-            vec![String::new(); completions.len()],
-            vec![String::new(); completions.len()],
-        )
-    };
+    py.detach(|| {
+        Ok(DEFAULT_EVALUATOR.evaluate_execution_batch(&completions, &tests, &entry_points))
+    })
+}
+
+/// Module-level function for execution reward over an iterable of samples (uses default evaluator).
+///
+/// Pulls `(completion, test, entry_point)` tuples from any Python iterable, e.g. a generator
+/// fed by a dataset prefetch thread.
+///
+/// # Examples
+/// ```python
+/// from fastrlrewards import execution_reward_stream
+///
+/// samples = ((s["completion"], s["test"], s["entry_point"]) for s in dataset)
+/// scores = execution_reward_stream(samples)
+/// ```
+#[pyfunction]
+pub fn execution_reward_stream(py: Python, samples: &Bound<'_, PyAny>) -> PyResult<Vec<f64>> {
+    let columns = extract_samples_from_iterable(samples)?;
+    let (completions, tests, entry_points) = columns.borrow();
 
     py.detach(|| {
         Ok(DEFAULT_EVALUATOR.evaluate_execution_batch(&completions, &tests, &entry_points))
     })
 }
 
+/// Module-level function for execution reward with interned inputs (uses default evaluator).
+///
+/// Use when many completions share the same test (e.g. GRPO rollouts of one prompt):
+/// only the distinct strings are converted, the rest is a list of indices.
+///
+/// # Examples
+/// ```python
+/// from fastrlrewards import execution_reward_interned
+///
+/// index = {}
+/// test_ids = [index.setdefault(t, len(index)) for t in tests]
+/// unique_tests = list(index)
+/// scores = execution_reward_interned(
+///     completions, unique_tests, test_ids, unique_entry_points, entry_point_ids
+/// )
+/// ```
+#[pyfunction]
+pub fn execution_reward_interned(
+    py: Python,
+    completions: &Bound<'_, PyList>,
+    unique_tests: Vec<String>,
+    test_ids: Vec<u32>,
+    unique_entry_points: Vec<String>,
+    entry_point_ids: Vec<u32>,
+) -> PyResult<Vec<f64>> {
+    let completion_objs = extract_completions_from_pylist(completions)?;
+    let completions = borrow_strs(&completion_objs);
+    let tests = resolve_interned(&unique_tests, &test_ids, "test_ids", completions.len())?;
+    let entry_points = resolve_interned(
+        &unique_entry_points,
+        &entry_point_ids,
+        "entry_point_ids",
+        completions.len(),
+    )?;
+
+    py.detach(|| {
+        Ok(DEFAULT_EVALUATOR.evaluate_execution_batch(&completions, &tests, &entry_points))
+    })
+}
+
+/// Module-level function for execution reward over a list of sample dicts (uses default evaluator).
+///
+/// Rows are read once each; no parallel `completions` / `tests` / `entry_points` lists.
+///
+/// # Examples
+/// ```python
+/// from fastrlrewards import execution_reward_dict_batch
+///
+/// samples = list(dataset)  # [{"completion": ..., "test": ..., "entry_point": ...}, ...]
+/// scores = execution_reward_dict_batch(samples)
+/// ```
+#[pyfunction]
+pub fn execution_reward_dict_batch(py: Python, samples: &Bound<'_, PyList>) -> PyResult<Vec<f64>> {
+    let columns = extract_rows_from_dicts(samples)?;
+    let (completions, tests, entry_points) = columns.borrow();
+
+    py.detach(|| {
+        Ok(DEFAULT_EVALUATOR.evaluate_execution_batch(&completions, &tests, &entry_points))
+    })
+}
+
+/// Module-level function for execution reward as a bit-packed mask (uses default evaluator).
+///
+/// Bit `i % 8` of byte `i / 8` is set if completion `i` passed all tests, i.e.
+/// `numpy.unpackbits(mask, bitorder="little")[:len(completions)]` gives the rewards.
+///
+/// # Examples
+/// ```python
+/// from fastrlrewards import count_passed, execution_reward_mask
+///
+/// mask = execution_reward_mask(completions, test=tests, entry_point=entry_points)
+/// print(f"{count_passed(mask)}/{len(completions)} passed")
+/// ```
+#[pyfunction]
+#[pyo3(signature = (completions, **kwargs))]
+pub fn execution_reward_mask<'py>(
+    py: Python<'py>,
+    completions: &Bound<'py, PyList>,
+    kwargs: Option<&Bound<'py, PyDict>>,
+) -> PyResult<Bound<'py, PyBytes>> {
+    let columns = extract_kwarg_columns(py, completions, kwargs)?;
+    let (completions, tests, entry_points) = columns.borrow();
+
+    let mask = py
+        .detach(|| DEFAULT_EVALUATOR.evaluate_execution_mask(&completions, &tests, &entry_points));
+    Ok(PyBytes::new(py, &mask.to_le_bytes()))
+}
+
+/// Number of passed completions in a mask returned by `execution_reward_mask`.
+///
+/// Popcount over the packed bytes, 64 bits at a time.
+#[pyfunction]
+pub fn count_passed(mask: &[u8]) -> u64 {
+    count_ones_in_bytes(mask)
+}
+
 // ==========================================================================================
 
 /// Helper function to extract completions from various Python input formats:
@@ -203,62 +426,242 @@ pub fn execution_reward(
 /// - Dicts with "content": `[{"content": "code1"}]` (TRL)
 /// - Lists of dicts: `[[{"content": "code1"}]]` (some TRL versions)
 /// - Fallback to string conversion
-fn extract_completions_from_pylist(completions: &Bound<'_, PyList>) -> PyResult<Vec<String>> {
-    let mut result = Vec::with_capacity(completions.len());
-
-    for item in completions.iter() {
-        let text = if let Ok(s) = item.extract::<String>() {
-            // Case 1: Direct string
-            s
-        } else if let Ok(dict) = item.downcast::<PyDict>() {
-            // Case 2: Dictionary with "content" key
-            dict.get_item("content")?
-                .and_then(|value| value.extract::<String>().ok())
-                .unwrap_or_default()
-        } else if let Ok(list) = item.downcast::<PyList>() {
-            // Case 3: List of dicts (take first element)
-            if !list.is_empty() {
-                if let Ok(first) = list.get_item(0) {
-                    if let Ok(dict) = first.downcast::<PyDict>() {
-                        // First element is a dict - extract "content"
-                        dict.get_item("content")?
-                            .and_then(|value| value.extract::<String>().ok())
-                            .unwrap_or_default()
-                    } else {
-                        // First element is not a dict - convert to string
-                        first.str()?.to_string()
-                    }
+///
+/// Returns the Python string objects themselves (no copy); see [`borrow_strs`].
+fn extract_completions_from_pylist<'py>(
+    completions: &Bound<'py, PyList>,
+) -> PyResult<Vec<Bound<'py, PyString>>> {
+    completions
+        .iter()
+        .map(|item| completion_text(&item))
+        .collect()
+}
+
+/// Helper function to normalize one completion (see [`extract_completions_from_pylist`])
+fn completion_text<'py>(item: &Bound<'py, PyAny>) -> PyResult<Bound<'py, PyString>> {
+    let py = item.py();
+
+    let text = if let Ok(s) = item.downcast::<PyString>() {
+        // Case 1: Direct string
+        s.clone()
+    } else if let Ok(dict) = item.downcast::<PyDict>() {
+        // Case 2: Dictionary with "content" key
+        dict_content(dict)?
+    } else if let Ok(list) = item.downcast::<PyList>() {
+        // Case 3: List of dicts (take first element)
+        if !list.is_empty() {
+            if let Ok(first) = list.get_item(0) {
+                if let Ok(dict) = first.downcast::<PyDict>() {
+                    // First element is a dict - extract "content"
+                    dict_content(dict)?
                 } else {
-                    String::new()
+                    // First element is not a dict - convert to string
+                    first.str()?
                 }
             } else {
-                String::new()
+                PyString::new(py, "")
             }
         } else {
-            // Case 4: Fallback - convert to string
-            item.str()?.to_string()
+            PyString::new(py, "")
+        }
+    } else {
+        // Case 4: Fallback - convert to string
+        item.str()?
+    };
+
+    Ok(text)
+}
+
+/// Helper function to get `dict["content"]` (empty string if missing or not a string)
+fn dict_content<'py>(dict: &Bound<'py, PyDict>) -> PyResult<Bound<'py, PyString>> {
+    Ok(dict
+        .get_item("content")?
+        .and_then(|value| value.downcast_into::<PyString>().ok())
+        .unwrap_or_else(|| PyString::new(dict.py(), "")))
+}
+
+/// Helper function to borrow the UTF-8 contents of Python strings without copying.
+///
+/// Relies on CPython's PEP 393 string layout: compact ASCII strings already are UTF-8,
+/// and other strings cache their UTF-8 encoding on the object, so each `&str` points into
+/// the Python object. Only strings that cannot be encoded (lone surrogates) are copied,
+/// lossily. The borrows stay valid while the GIL is released because `strings` holds a
+/// reference to every object and Python strings are immutable.
+fn borrow_strs<'a>(strings: &'a [Bound<'_, PyString>]) -> Vec<Cow<'a, str>> {
+    strings.iter().map(|s| s.to_string_lossy()).collect()
+}
+
+/// Python string objects for `(completion, test, entry_point)` rows, one vector per column
+///
+/// Holding the objects keeps their UTF-8 buffers alive while the GIL is released, so
+/// [`StringColumns::borrow`] can hand out zero-copy views for the detached evaluation.
+struct StringColumns<'py> {
+    completions: Vec<Bound<'py, PyString>>,
+    tests: Vec<Bound<'py, PyString>>,
+    entry_points: Vec<Bound<'py, PyString>>,
+}
+
+/// Borrowed `(completions, tests, entry_points)`, see [`borrow_strs`]
+type BorrowedColumns<'a> = (Vec<Cow<'a, str>>, Vec<Cow<'a, str>>, Vec<Cow<'a, str>>);
+
+impl StringColumns<'_> {
+    fn with_capacity(capacity: usize) -> Self {
+        Self {
+            completions: Vec::with_capacity(capacity),
+            tests: Vec::with_capacity(capacity),
+            entry_points: Vec::with_capacity(capacity),
+        }
+    }
+
+    fn borrow(&self) -> BorrowedColumns<'_> {
+        (
+            borrow_strs(&self.completions),
+            borrow_strs(&self.tests),
+            borrow_strs(&self.entry_points),
+        )
+    }
+}
+
+/// Helper function to extract completions plus the `test=` / `entry_point=` kwargs
+fn extract_kwarg_columns<'py>(
+    py: Python<'py>,
+    completions: &Bound<'py, PyList>,
+    kwargs: Option<&Bound<'py, PyDict>>,
+) -> PyResult<StringColumns<'py>> {
+    let completions = extract_completions_from_pylist(completions)?;
+    let (tests, entry_points) = extract_test_kwargs(py, kwargs, completions.len())?;
+    Ok(StringColumns {
+        completions,
+        tests,
+        entry_points,
+    })
+}
+
+/// Helper function to extract the `test=` and `entry_point=` kwargs
+/// (empty strings for every completion when no kwargs are given)
+fn extract_test_kwargs<'py>(
+    py: Python<'py>,
+    kwargs: Option<&Bound<'py, PyDict>>,
+    expected_len: usize,
+) -> PyResult<(Vec<Bound<'py, PyString>>, Vec<Bound<'py, PyString>>)> {
+    match kwargs {
+        Some(kwargs) => Ok((
+            extract_string_list_from_kwargs(kwargs, "test", expected_len)?,
+            extract_string_list_from_kwargs(kwargs, "entry_point", expected_len)?,
+        )),
+        None => Ok((
+            vec![PyString::new(py, ""); expected_len],
+            vec![PyString::new(py, ""); expected_len],
+        )),
+    }
+}
+
+/// Helper function to collect `(completion, test, entry_point)` tuples from any Python iterable
+///
+/// # Errors
+/// Returns an error if the object is not iterable or an item is not a 3-tuple of strings
+fn extract_samples_from_iterable<'py>(samples: &Bound<'py, PyAny>) -> PyResult<StringColumns<'py>> {
+    // Generators have no length; fall back to growing the vectors
+    let mut columns = StringColumns::with_capacity(samples.len().unwrap_or(0));
+
+    for item in samples.try_iter()? {
+        let (completion, test, entry_point) = item?.extract()?;
+        columns.completions.push(completion);
+        columns.tests.push(test);
+        columns.entry_points.push(entry_point);
+    }
+
+    Ok(columns)
+}
+
+/// Helper function to read `completion`, `test` and `entry_point` from a list of sample dicts
+///
+/// The completion is taken from `"completion"` (falling back to `"content"`) and accepts
+/// the same formats as [`extract_completions_from_pylist`]. Missing or non-string
+/// `"test"` / `"entry_point"` values become empty strings, as with missing kwargs.
+///
+/// # Errors
+/// Returns an error if an item of `samples` is not a dict
+fn extract_rows_from_dicts<'py>(samples: &Bound<'py, PyList>) -> PyResult<StringColumns<'py>> {
+    let py = samples.py();
+    let mut columns = StringColumns::with_capacity(samples.len());
+
+    for item in samples.iter() {
+        let row = item.downcast::<PyDict>()?;
+
+        let completion = match row.get_item("completion")? {
+            Some(value) => completion_text(&value)?,
+            None => dict_content(row)?,
+        };
+        let string_field = |key: &str| -> PyResult<Bound<'py, PyString>> {
+            Ok(row
+                .get_item(key)?
+                .and_then(|value| value.downcast_into::<PyString>().ok())
+                .unwrap_or_else(|| PyString::new(py, "")))
         };
 
-        result.push(text);
+        columns.completions.push(completion);
+        columns.tests.push(string_field("test")?);
+        columns.entry_points.push(string_field("entry_point")?);
     }
 
-    Ok(result)
+    Ok(columns)
+}
+
+/// Helper function to expand interned ids into per-completion borrows of the unique strings
+///
+/// # Errors
+/// Returns an error if `ids` length does not match `expected_len` or an id is out of range
+fn resolve_interned<'a>(
+    unique: &'a [String],
+    ids: &[u32],
+    key: &str,
+    expected_len: usize,
+) -> PyResult<Vec<&'a str>> {
+    if ids.len() != expected_len {
+        return Err(PyValueError::new_err(format!(
+            "Length mismatch: {} has {} items but expected {} (same as completions)",
+            key,
+            ids.len(),
+            expected_len
+        )));
+    }
+
+    ids.iter()
+        .map(|&id| {
+            unique.get(id as usize).map(String::as_str).ok_or_else(|| {
+                PyValueError::new_err(format!(
+                    "{} contains {} but only {} unique values were given",
+                    key,
+                    id,
+                    unique.len()
+                ))
+            })
+        })
+        .collect()
 }
 
 /// Helper function to extract string lists from kwargs (for test= and entry_point= arguments)
 ///
+/// Non-string items become empty strings.
+///
 /// # Errors
 /// Returns an error if the provided list length does not match the expected length
-fn extract_string_list_from_kwargs(
-    kwargs: &Bound<'_, PyDict>,
+fn extract_string_list_from_kwargs<'py>(
+    kwargs: &Bound<'py, PyDict>,
     key: &str,
     expected_len: usize,
-) -> PyResult<Vec<String>> {
+) -> PyResult<Vec<Bound<'py, PyString>>> {
+    let py = kwargs.py();
+
     if let Some(value) = kwargs.get_item(key)? {
         if let Ok(list) = value.downcast::<PyList>() {
             let mut result = Vec::with_capacity(list.len());
             for item in list.iter() {
-                result.push(item.extract::<String>().unwrap_or_default());
+                result.push(
+                    item.downcast_into::<PyString>()
+                        .unwrap_or_else(|_| PyString::new(py, "")),
+                );
             }
 
             // Validate length
@@ -276,5 +679,5 @@ fn extract_string_list_from_kwargs(
     }
 
     // Key not found - return empty strings (allow missing kwargs entirely)
-    Ok(vec![String::new(); expected_len])
+    Ok(vec![PyString::new(py, ""); expected_len])
 }
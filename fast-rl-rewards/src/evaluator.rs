@@ -3,13 +3,19 @@
 //! Core reward evaluation logic.
 
 use crate::extraction::extract_code_from_completion;
+use crate::reward_mask::RewardMask;
 use crate::sandbox::run_sandboxed_tests;
 use crate::test_wrapper::wrap_tests_for_complete_execution;
+use crate::worker_pool::PyWorkerPool;
 use anyhow::{Result, ensure};
 use once_cell::sync::Lazy;
 use rayon::ThreadPoolBuilder;
 use rayon::prelude::*;
 use regex::Regex;
+use std::collections::HashMap;
+
+/// Standard typing imports prepended to every extracted solution.
+const TYPING_IMPORTS: &str = "from typing import List, Optional, Dict, Set, Tuple, Any\n\n";
 
 // ==========================================================================================
 
@@ -38,6 +44,16 @@ pub struct EvaluatorConfig {
     /// - `Some(n)`: Use exactly `n` threads
     /// - `None`: Use default (number of CPU cores)
     pub num_threads: Option<usize>,
+
+    /// Run tests on a pool of persistent sandboxed Python workers.
+    ///
+    /// - `true`: Each worker starts Firejail + Python once and forks a fresh child per
+    ///   completion, so startup cost is amortized across batches
+    /// - `false` (default): Spawn a new Firejail + Python process per completion
+    ///
+    /// Pooled workers share one sandbox across completions; see `worker_pool` for how
+    /// programs are kept apart.
+    pub persistent_workers: bool,
 }
 
 impl Default for EvaluatorConfig {
@@ -47,6 +63,7 @@ impl Default for EvaluatorConfig {
             memory_limit_mb: 512,
             cpu_time_limit: 12,
             num_threads: Some(32),
+            persistent_workers: false,
         }
     }
 }
@@ -99,6 +116,7 @@ impl EvaluatorConfig {
 /// ```
 pub struct RewardEvaluator {
     config: EvaluatorConfig,
+    worker_pool: Option<PyWorkerPool>,
 }
 
 impl RewardEvaluator {
@@ -112,7 +130,18 @@ impl RewardEvaluator {
                 .ok();
         }
 
-        Ok(Self { config })
+        let worker_pool = config.persistent_workers.then(|| {
+            PyWorkerPool::new(
+                config.timeout_seconds,
+                config.memory_limit_mb,
+                config.cpu_time_limit,
+            )
+        });
+
+        Ok(Self {
+            config,
+            worker_pool,
+        })
     }
 
     /// Check if text has valid `<think>...</think>` and `<answer>...</answer>` format.
@@ -132,11 +161,11 @@ impl RewardEvaluator {
     ///
     /// Returns 1.0 for properly formatted outputs (with both `<think>` and `<answer>` tags),
     /// 0.0 otherwise.
-    pub fn evaluate_response_format(&self, completions: &[String]) -> Vec<f64> {
+    pub fn evaluate_response_format<S: AsRef<str>>(&self, completions: &[S]) -> Vec<f64> {
         completions
             .iter()
             .map(|completion| {
-                if Self::has_valid_format(completion) {
+                if Self::has_valid_format(completion.as_ref()) {
                     1.0
                 } else {
                     0.0
@@ -147,23 +176,26 @@ impl RewardEvaluator {
 
     /// Evaluate a single LLM output by executing the extracted code against tests.
     ///
-    /// Returns 1.0 if all tests pass, 0.0 otherwise.
-    fn evaluate_single_execution(&self, completion: &str, test: &str, entry_point: &str) -> f64 {
+    /// Returns `true` if all tests pass, `false` otherwise.
+    ///
+    /// `wrapped_tests` is `wrap_tests_for_complete_execution(test, entry_point)`, computed
+    /// once per distinct pair by the caller.
+    fn evaluate_single_execution(
+        &self,
+        completion: &str,
+        test: &str,
+        entry_point: &str,
+        wrapped_tests: &str,
+    ) -> bool {
         if test.is_empty() || test == "null" {
-            return 0.0;
+            return false;
         }
 
         let code = extract_code_from_completion(completion);
         if code.trim().is_empty() {
-            return 0.0;
+            return false;
         }
 
-        // Add standard typing imports
-        let code_with_imports = format!(
-            "from typing import List, Optional, Dict, Set, Tuple, Any\n\n{}",
-            code
-        );
-
         // Validate entry point exists in the generated code.
         //
         // The entry point specifies how the test code will call the solution:
@@ -189,65 +221,99 @@ impl RewardEvaluator {
             };
 
             // Verify method/function definition exists
-            if !code_with_imports.contains(&format!("def {}", method_name)) {
-                return 0.0;
+            if !code.contains(&format!("def {}", method_name)) {
+                return false;
             }
 
             // For class-based entry points, verify the class exists
-            if entry_point.contains("Solution().") && !code_with_imports.contains("class Solution")
-            {
-                return 0.0;
+            if entry_point.contains("Solution().") && !code.contains("class Solution") {
+                return false;
             }
         }
 
-        // Wrap test code to run all tests
-        let wrapped_tests = wrap_tests_for_complete_execution(test, entry_point);
-
-        // Combine solution and tests
-        let full_code = format!("{}\n\n{}", code_with_imports, wrapped_tests);
+        // Combine standard typing imports, solution and tests in a single buffer.
+        // Each Rayon worker builds exactly one program string per completion.
+        let mut full_code =
+            String::with_capacity(TYPING_IMPORTS.len() + code.len() + wrapped_tests.len() + 2);
+        full_code.push_str(TYPING_IMPORTS);
+        full_code.push_str(&code);
+        full_code.push_str("\n\n");
+        full_code.push_str(wrapped_tests);
 
         // Execute in sandbox and return result
-        match run_sandboxed_tests(
-            &full_code,
-            self.config.timeout_seconds,
-            self.config.memory_limit_mb,
-            self.config.cpu_time_limit,
-        ) {
-            Ok((all_passed, _tests_passed, _tests_total)) => {
-                if all_passed {
-                    1.0
-                } else {
-                    0.0
-                }
-            }
+        let outcome = match &self.worker_pool {
+            Some(pool) => pool.run_tests(&full_code).map_err(|e| e.to_string()),
+            None => run_sandboxed_tests(
+                &full_code,
+                self.config.timeout_seconds,
+                self.config.memory_limit_mb,
+                self.config.cpu_time_limit,
+            )
+            .map_err(|e| e.to_string()),
+        };
+
+        match outcome {
+            Ok((all_passed, _tests_passed, _tests_total)) => all_passed,
             Err(e) => {
                 eprintln!("Execution error: {}", e);
-                0.0
+                false
             }
         }
     }
 
     /// Evaluate sandboxed code execution for a batch in parallel.
     ///
+    /// Same as [`Self::evaluate_execution_mask`], expanded to one float per completion.
+    ///
+    /// # Returns
+    /// Vector of rewards (1.0 = all tests passed, 0.0 = failed or error)
+    ///
+    /// # Panics
+    /// Panics if `completions`, `tests`, and `entry_points` have different lengths.
+    pub fn evaluate_execution_batch<C, T, E>(
+        &self,
+        completions: &[C],
+        tests: &[T],
+        entry_points: &[E],
+    ) -> Vec<f64>
+    where
+        C: AsRef<str> + Sync,
+        T: AsRef<str> + Sync,
+        E: AsRef<str> + Sync,
+    {
+        self.evaluate_execution_mask(completions, tests, entry_points)
+            .to_rewards()
+    }
+
+    /// Evaluate sandboxed code execution for a batch in parallel, one bit per completion.
+    ///
     /// Uses Rayon to process completions (LLM outputs) in parallel across the thread pool.
     /// Each completion is evaluated independently with no shared state.
     ///
+    /// Accepts owned (`String`) or borrowed (`&str`) strings, so interned inputs can be
+    /// evaluated without cloning each shared test per completion.
+    ///
     /// # Arguments
     /// - `completions`: LLM outputs to evaluate
     /// - `tests`: Test code for each completion
     /// - `entry_points`: Function/method to test for each completion (e.g., "add" or "Solution().method")
     ///
     /// # Returns
-    /// Vector of rewards (1.0 = all tests passed, 0.0 = failed or error)
+    /// Bit-packed pass/fail mask (bit set = all tests passed)
     ///
     /// # Panics
     /// Panics if `completions`, `tests`, and `entry_points` have different lengths.
-    pub fn evaluate_execution_batch(
+    pub fn evaluate_execution_mask<C, T, E>(
         &self,
-        completions: &[String],
-        tests: &[String],
-        entry_points: &[String],
-    ) -> Vec<f64> {
+        completions: &[C],
+        tests: &[T],
+        entry_points: &[E],
+    ) -> RewardMask
+    where
+        C: AsRef<str> + Sync,
+        T: AsRef<str> + Sync,
+        E: AsRef<str> + Sync,
+    {
         assert_eq!(
             completions.len(),
             tests.len(),
@@ -259,12 +325,38 @@ impl RewardEvaluator {
             "Completions and entry_points must have same length"
         );
 
+        // Wrap test code to run all tests, once per distinct (test, entry_point) pair.
+        // GRPO batches hold several completions per prompt, so most pairs repeat.
+        let mut pair_ids: HashMap<(&str, &str), usize> = HashMap::new();
+        let mut unique_pairs: Vec<(&str, &str)> = Vec::new();
+        let wrapped_ids: Vec<usize> = tests
+            .iter()
+            .zip(entry_points)
+            .map(|(test, entry_point)| {
+                let pair = (test.as_ref(), entry_point.as_ref());
+                *pair_ids.entry(pair).or_insert_with(|| {
+                    unique_pairs.push(pair);
+                    unique_pairs.len() - 1
+                })
+            })
+            .collect();
+        let wrapped: Vec<String> = unique_pairs
+            .par_iter()
+            .map(|&(test, entry_point)| wrap_tests_for_complete_execution(test, entry_point))
+            .collect();
+
         completions
             .par_iter()
             .zip(tests.par_iter())
             .zip(entry_points.par_iter())
-            .map(|((completion, test), entry_point)| {
-                self.evaluate_single_execution(completion, test, entry_point)
+            .zip(wrapped_ids.par_iter())
+            .map(|(((completion, test), entry_point), &wrapped_id)| {
+                self.evaluate_single_execution(
+                    completion.as_ref(),
+                    test.as_ref(),
+                    entry_point.as_ref(),
+                    &wrapped[wrapped_id],
+                )
             })
             .collect()
     }
@@ -19,40 +19,182 @@
 //! completion = "<think>reasoning</think>\n<answer>```python\nprint('hi')\n```</answer>"
 //! code = fastrlrewards.extract_code_from_completion(completion)
 //! assert code == "print('hi')"
+//!
+//! codes = fastrlrewards.extract_code_batch([completion, completion])
+//! assert codes == ["print('hi')", "print('hi')"]
 //! ```
 
-use once_cell::sync::Lazy;
+use memchr::{memchr_iter, memmem};
 use pyo3::prelude::*;
-use regex::Regex;
+use pyo3::types::{PyList, PyString};
+use rayon::prelude::*;
+
+// All patterns are literals, so instead of a regex engine we jump between candidates with
+// SIMD `memchr`/`memmem` and confirm each one with a short comparison. Behaviour matches
+// the regexes noted on each helper.
+
+const ANSWER_OPEN: &str = "<answer>";
+const ANSWER_CLOSE: &str = "</answer>";
+const FENCE: &str = "```";
+const FENCE_PYTHON: &str = "```python";
+
+/// Content of the first `<answer>...</answer>` pair, case-insensitive.
+///
+/// Same as `(?is)<answer>(.*?)</answer>`. If the first opening tag has no closing tag
+/// after it, no later one can, so only the first opening tag is considered.
+fn find_answer(text: &str) -> Option<&str> {
+    let open = find_tag(text, 0, ANSWER_OPEN)?;
+    let close = find_tag(text, open.1, ANSWER_CLOSE)?;
+    Some(&text[open.1..close.0])
+}
+
+/// First case-insensitive occurrence of `tag` at or after `from`, as a byte range.
+fn find_tag(text: &str, from: usize, tag: &str) -> Option<(usize, usize)> {
+    memchr_iter(b'<', &text.as_bytes()[from..]).find_map(|offset| {
+        let start = from + offset;
+        match_tag(&text[start..], tag).map(|len| (start, start + len))
+    })
+}
+
+/// Byte length of `tag` matched case-insensitively at the start of `text`.
+///
+/// Follows the regex crate's Unicode case folding, where `s` also matches `ſ`
+/// (U+017F LATIN SMALL LETTER LONG S).
+fn match_tag(text: &str, tag: &str) -> Option<usize> {
+    let mut chars = text.char_indices();
+    for expected in tag.chars() {
+        let (_, c) = chars.next()?;
+        if !(c.eq_ignore_ascii_case(&expected) || (expected == 's' && c == '\u{17F}')) {
+            return None;
+        }
+    }
+    Some(chars.next().map_or(text.len(), |(i, _)| i))
+}
+
+/// Content of the first ```` ```python ```` fenced block.
+///
+/// Same as ``(?s)```python\s*\n(.*?)\n``` ``.
+fn find_python_block(text: &str) -> Option<&str> {
+    // Bodies starting past the last closing fence cannot match; checking that up front
+    // keeps unterminated blocks from rescanning the rest of the text per opener
+    let last_close = memmem::rfind(text.as_bytes(), b"\n```")?;
+
+    memmem::find_iter(text.as_bytes(), FENCE_PYTHON).find_map(|start| {
+        let after = start + FENCE_PYTHON.len();
+        let ws_end = after + whitespace_len(&text[after..]);
+
+        // `\s*` is greedy: try the last newline of the whitespace run first and back off
+        // to earlier ones, taking the nearest closing fence after each
+        text[after..ws_end]
+            .rmatch_indices('\n')
+            .find_map(|(offset, _)| {
+                let body = after + offset + 1;
+                if body > last_close {
+                    return None;
+                }
+                let end = memmem::find(&text.as_bytes()[body..], b"\n```")?;
+                Some(&text[body..body + end])
+            })
+    })
+}
 
-// Regex pattern for content within <answer>...</answer> tags (case-insensitive)
-static ANSWER_PATTERN: Lazy<Regex> =
-    Lazy::new(|| Regex::new(r"(?is)<answer>(.*?)</answer>").unwrap());
+/// Length in bytes of the leading run of whitespace in `text` (regex `\s*`).
+fn whitespace_len(text: &str) -> usize {
+    text.len() - text.trim_start().len()
+}
 
-// Regex pattern for markdown code blocks with Python language specifier
-static CODE_BLOCK_PATTERN: Lazy<Regex> =
-    Lazy::new(|| Regex::new(r"(?s)```python\s*\n(.*?)\n```").unwrap());
+/// Strip `prefix` followed by whitespace up to its last newline.
+///
+/// Same as replacing `^<prefix>\s*\n` with nothing.
+fn strip_fence_start<'a>(code: &'a str, prefix: &str) -> &'a str {
+    let Some(rest) = code.strip_prefix(prefix) else {
+        return code;
+    };
+    let ws = &rest[..whitespace_len(rest)];
+    match ws.rfind('\n') {
+        Some(i) => &rest[i + 1..],
+        None => code,
+    }
+}
 
-// Patterns for cleaning markdown code blocks inside answer tags
-static MARKDOWN_START_PYTHON: Lazy<Regex> = Lazy::new(|| Regex::new(r"^```python\s*\n").unwrap());
-static MARKDOWN_START_PLAIN: Lazy<Regex> = Lazy::new(|| Regex::new(r"^```\s*\n").unwrap());
-static MARKDOWN_END: Lazy<Regex> = Lazy::new(|| Regex::new(r"\n```\s*$").unwrap());
+/// Strip a closing fence at the end.
+///
+/// Same as replacing `\n```\s*$` with nothing.
+fn strip_fence_end(code: &str) -> &str {
+    code.trim_end().strip_suffix("\n```").unwrap_or(code)
+}
 
 #[pyfunction]
 pub fn extract_code_from_completion(completion: &str) -> String {
-    if let Some(captures) = ANSWER_PATTERN.captures(completion) {
-        let code = captures[1].trim();
+    if let Some(answer) = find_answer(completion) {
+        let code = answer.trim();
 
-        let code = MARKDOWN_START_PYTHON.replace(code, "");
-        let code = MARKDOWN_START_PLAIN.replace(&code, "");
-        let code = MARKDOWN_END.replace(&code, "");
+        let code = strip_fence_start(code, FENCE_PYTHON);
+        let code = strip_fence_start(code, FENCE);
+        let code = strip_fence_end(code);
 
-        return code.into_owned();
+        return code.to_string();
     }
 
-    if let Some(captures) = CODE_BLOCK_PATTERN.captures(completion) {
-        return captures[1].trim().to_string();
+    if let Some(block) = find_python_block(completion) {
+        return block.trim().to_string();
     }
 
     completion.trim().to_string()
 }
+
+/// Extract code from a batch of completions in a single call.
+///
+/// Collapses N Python -> Rust crossings into one. Each string is borrowed from the Python
+/// object's UTF-8 buffer (no copy), then the GIL is released and extraction runs in
+/// parallel with Rayon.
+///
+/// # Errors
+/// Returns an error if an item of `completions` is not a string.
+#[pyfunction]
+pub fn extract_code_batch(py: Python, completions: &Bound<'_, PyList>) -> PyResult<Vec<String>> {
+    // Hold our own references to the strings so the borrowed `&str`s stay valid while the
+    // GIL is released, even if another thread mutates the list meanwhile.
+    let strings = completions
+        .iter()
+        .map(|item| item.downcast_into::<PyString>())
+        .collect::<Result<Vec<_>, _>>()?;
+    let texts = strings
+        .iter()
+        .map(|s| s.to_str())
+        .collect::<PyResult<Vec<&str>>>()?;
+
+    Ok(py.detach(|| {
+        texts
+            .par_iter()
+            .map(|text| extract_code_from_completion(text))
+            .collect()
+    }))
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    /// Golden table shared with `tests/test_regex.py`.
+    const CASES: &str = include_str!("../tests/extract_code_cases.json");
+
+    #[test]
+    fn extract_code_golden() {
+        let cases: serde_json::Value = serde_json::from_str(CASES).unwrap();
+        let cases = cases.as_array().expect("golden table must be a JSON array");
+        assert!(!cases.is_empty());
+
+        for (i, case) in cases.iter().enumerate() {
+            let input = case["input"].as_str().unwrap();
+            let expected = case["expected"].as_str().unwrap();
+            assert_eq!(
+                extract_code_from_completion(input),
+                expected,
+                "case {}: {}",
+                i + 1,
+                case["name"]
+            );
+        }
+    }
+}
@@ -23,14 +23,18 @@
 //! - [`bindings`]: PyO3 Python interface
 //! - [`evaluator`]: Core evaluation logic with Rayon parallelism
 //! - [`extraction`]: Code extraction from structured responses
+//! - [`reward_mask`]: Bit-packed pass/fail rewards
 //! - [`test_wrapper`]: Test transformation for run-all-tests mode
 //! - [`sandbox`]: Firejail sandboxed execution
+//! - [`worker_pool`]: Persistent sandboxed Python workers
 
 mod bindings;
 mod evaluator;
 mod extraction;
+mod reward_mask;
 mod sandbox;
 mod test_wrapper;
+mod worker_pool;
 
 use pyo3::prelude::*;
 
@@ -42,16 +46,23 @@ fn fastrlrewards(m: &Bound<'_, PyModule>) -> PyResult<()> {
     // Convenience functions (module-level API using default PyRewardEvaluator)
     m.add_function(wrap_pyfunction!(bindings::format_reward, m)?)?;
     m.add_function(wrap_pyfunction!(bindings::execution_reward, m)?)?;
+    m.add_function(wrap_pyfunction!(bindings::execution_reward_stream, m)?)?;
+    m.add_function(wrap_pyfunction!(bindings::execution_reward_interned, m)?)?;
+    m.add_function(wrap_pyfunction!(bindings::execution_reward_dict_batch, m)?)?;
+    m.add_function(wrap_pyfunction!(bindings::execution_reward_mask, m)?)?;
+    m.add_function(wrap_pyfunction!(bindings::count_passed, m)?)?;
 
     // Utility functions
     m.add_function(wrap_pyfunction!(
         extraction::extract_code_from_completion,
         m
     )?)?;
+    m.add_function(wrap_pyfunction!(extraction::extract_code_batch, m)?)?;
     m.add_function(wrap_pyfunction!(
-        test_wrapper::wrap_tests_for_complete_execution,
+        test_wrapper::py_wrap_tests_for_complete_execution,
         m
     )?)?;
+    m.add_function(wrap_pyfunction!(test_wrapper::wrapped_tests_match, m)?)?;
     m.add_function(wrap_pyfunction!(sandbox::run_sandboxed_tests, m)?)?;
     Ok(())
 }
@@ -0,0 +1,212 @@
+//! src/reward_mask.rs
+//!
+//! Bit-packed storage for binary rewards.
+//!
+//! Execution rewards are pass/fail, so the evaluator records them one bit per completion
+//! instead of one `f64` (64x smaller) and only expands to floats at the Python boundary.
+//! Counting passes is a popcount over 64-bit words ([`count_ones_in_bytes`]).
+//!
+//! Rayon results collect straight into a mask: each split packs its own bits and the
+//! splits are concatenated in order, so no per-completion `bool` buffer is built.
+//!
+//! # Byte layout
+//! [`RewardMask::to_le_bytes`] stores completion `i` in bit `i % 8` of byte `i / 8`
+//! (LSB first), i.e. `numpy.unpackbits(mask, bitorder="little")[:n]` recovers the
+//! rewards. Padding bits after the last completion are zero.
+
+use rayon::iter::{FromParallelIterator, IntoParallelIterator, ParallelIterator};
+
+/// Pass/fail result per completion, packed 64 to a word.
+#[derive(Clone, Debug, Default, PartialEq, Eq)]
+pub struct RewardMask {
+    words: Vec<u64>,
+    len: usize,
+}
+
+impl RewardMask {
+    /// All-failed mask for `len` completions.
+    pub fn new(len: usize) -> Self {
+        Self {
+            words: vec![0; len.div_ceil(64)],
+            len,
+        }
+    }
+
+    /// Mark completion `i` as passed.
+    ///
+    /// # Panics
+    /// Panics if `i >= len`.
+    pub fn set(&mut self, i: usize) {
+        assert!(
+            i < self.len,
+            "index {} out of range for mask of {}",
+            i,
+            self.len
+        );
+        self.words[i / 64] |= 1 << (i % 64);
+    }
+
+    /// Append the result of the next completion, growing by one word every 64 completions.
+    pub fn push(&mut self, passed: bool) {
+        let bit = self.len % 64;
+        if bit == 0 {
+            self.words.push(0);
+        }
+        if passed {
+            *self.words.last_mut().unwrap() |= 1 << bit;
+        }
+        self.len += 1;
+    }
+
+    /// Append all completions of `other` after those of `self`.
+    fn append(&mut self, other: Self) {
+        let shift = self.len % 64;
+        if shift == 0 {
+            self.words.extend(other.words);
+        } else {
+            // Each word of `other` straddles the current last word and the next one
+            for word in other.words {
+                *self.words.last_mut().unwrap() |= word << shift;
+                self.words.push(word >> (64 - shift));
+            }
+        }
+        self.len += other.len;
+        // The last pushed word may hold only (zero) padding
+        self.words.truncate(self.len.div_ceil(64));
+    }
+
+    /// Whether completion `i` passed.
+    ///
+    /// # Panics
+    /// Panics if `i >= len`.
+    pub fn get(&self, i: usize) -> bool {
+        assert!(
+            i < self.len,
+            "index {} out of range for mask of {}",
+            i,
+            self.len
+        );
+        self.words[i / 64] & (1 << (i % 64)) != 0
+    }
+
+    /// Expand to one reward per completion (1.0 = passed, 0.0 = failed).
+    pub fn to_rewards(&self) -> Vec<f64> {
+        (0..self.len)
+            .map(|i| if self.get(i) { 1.0 } else { 0.0 })
+            .collect()
+    }
+
+    /// Packed bytes, `ceil(len / 8)` long (see the module docs for the bit order).
+    pub fn to_le_bytes(&self) -> Vec<u8> {
+        let mut bytes: Vec<u8> = self.words.iter().flat_map(|w| w.to_le_bytes()).collect();
+        bytes.truncate(self.len.div_ceil(8));
+        bytes
+    }
+}
+
+impl FromIterator<bool> for RewardMask {
+    fn from_iter<I: IntoIterator<Item = bool>>(iter: I) -> Self {
+        let iter = iter.into_iter();
+        let mut mask = Self {
+            words: Vec::with_capacity(iter.size_hint().0.div_ceil(64)),
+            len: 0,
+        };
+        for passed in iter {
+            mask.push(passed);
+        }
+        mask
+    }
+}
+
+impl FromParallelIterator<bool> for RewardMask {
+    fn from_par_iter<I: IntoParallelIterator<Item = bool>>(par_iter: I) -> Self {
+        // Rayon's reduce keeps splits in order, so appending preserves completion indices
+        par_iter
+            .into_par_iter()
+            .fold(Self::default, |mut mask, passed| {
+                mask.push(passed);
+                mask
+            })
+            .reduce(Self::default, |mut left, right| {
+                left.append(right);
+                left
+            })
+    }
+}
+
+/// Number of set bits in a packed mask, read 8 bytes at a time.
+pub fn count_ones_in_bytes(bytes: &[u8]) -> u64 {
+    let mut chunks = bytes.chunks_exact(8);
+    let words: u64 = chunks
+        .by_ref()
+        .map(|chunk| u64::from(u64::from_le_bytes(chunk.try_into().unwrap()).count_ones()))
+        .sum();
+    let tail: u64 = chunks
+        .remainder()
+        .iter()
+        .map(|b| u64::from(b.count_ones()))
+        .sum();
+    words + tail
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+    use rayon::prelude::*;
+
+    #[test]
+    fn packs_and_expands() {
+        let passed: Vec<bool> = (0..131).map(|i| i % 3 == 0 || i == 130).collect();
+        let mask: RewardMask = passed.iter().copied().collect();
+
+        let expected: Vec<f64> = passed.iter().map(|&p| if p { 1.0 } else { 0.0 }).collect();
+        assert_eq!(mask.to_rewards(), expected);
+
+        let bytes = mask.to_le_bytes();
+        assert_eq!(bytes.len(), 17);
+        assert_eq!(bytes[0], 0b0100_1001);
+        assert_eq!(
+            count_ones_in_bytes(&bytes),
+            passed.iter().filter(|&&p| p).count() as u64
+        );
+    }
+
+    #[test]
+    fn set_matches_collect() {
+        let mut mask = RewardMask::new(70);
+        mask.set(0);
+        mask.set(69);
+
+        let collected: RewardMask = (0..70).map(|i| i == 0 || i == 69).collect();
+        assert_eq!(mask, collected);
+        assert!(mask.get(69) && !mask.get(68));
+    }
+
+    #[test]
+    fn append_keeps_order() {
+        let passed: Vec<bool> = (0..300).map(|i| i % 7 == 0 || i % 11 == 3).collect();
+        let expected: RewardMask = passed.iter().copied().collect();
+
+        for split in [0, 1, 63, 64, 65, 128, 200, 300] {
+            let mut left: RewardMask = passed[..split].iter().copied().collect();
+            left.append(passed[split..].iter().copied().collect());
+            assert_eq!(left, expected, "split at {}", split);
+        }
+    }
+
+    #[test]
+    fn parallel_collect_matches_sequential() {
+        let passed: Vec<bool> = (0..10_000).map(|i| i % 3 == 1 || i % 64 == 0).collect();
+        let sequential: RewardMask = passed.iter().copied().collect();
+        let parallel: RewardMask = passed.par_iter().copied().collect();
+        assert_eq!(parallel, sequential);
+    }
+
+    #[test]
+    fn empty_mask() {
+        let mask: RewardMask = std::iter::empty().collect();
+        assert_eq!(mask, RewardMask::new(0));
+        assert!(mask.to_le_bytes().is_empty());
+        assert!(mask.to_rewards().is_empty());
+    }
+}
@@ -30,6 +30,37 @@ use wait_timeout::ChildExt;
 static TEST_RESULTS_PATTERN: Lazy<Regex> =
     Lazy::new(|| Regex::new(r"TESTS_PASSED:(\d+)/(\d+)").unwrap());
 
+/// Base Firejail command with the isolation flags shared by one-shot runs and pool workers.
+pub(crate) fn firejail_command() -> Command {
+    let mut cmd = Command::new("firejail");
+    cmd.arg("--quiet")
+        .arg("--private") // Isolated filesystem
+        .arg("--private-dev")
+        .arg("--net=none") // No network access
+        .arg("--x11=none") // No X11
+        .arg("--nodbus"); // No D-Bus
+    cmd
+}
+
+/// Parse `TESTS_PASSED:X/Y` from program output.
+///
+/// # Returns
+/// `(all_passed, tests_passed, tests_total)` where `all_passed` requires exit code 0
+/// and at least one test run, all of them passing.
+pub(crate) fn parse_test_results(stdout: &str, exit_code: i32) -> (bool, i32, i32) {
+    let (tests_passed, tests_total) = TEST_RESULTS_PATTERN
+        .captures(stdout)
+        .map(|caps| {
+            let passed = caps[1].parse::<i32>().unwrap_or(0);
+            let total = caps[2].parse::<i32>().unwrap_or(0);
+            (passed, total)
+        })
+        .unwrap_or((0, 0));
+
+    let all_passed = exit_code == 0 && tests_passed == tests_total && tests_total > 0;
+    (all_passed, tests_passed, tests_total)
+}
+
 /// Execute Python code with tests in a Firejail sandbox.
 ///
 /// Creates a temporary file, writes the code, and executes it with strict
@@ -75,14 +106,8 @@ pub fn run_sandboxed_tests(
 
     // Build firejail command
     let memory_limit_bytes = memory_limit_mb * 1_000_000;
-    let mut cmd = Command::new("firejail");
-    cmd.arg("--quiet")
-        .arg("--private") // Isolated filesystem
-        .arg("--private-dev")
-        .arg("--net=none") // No network access
-        .arg("--x11=none") // No X11
-        .arg("--nodbus") // No D-Bus
-        .arg(format!("--rlimit-as={}", memory_limit_bytes))
+    let mut cmd = firejail_command();
+    cmd.arg(format!("--rlimit-as={}", memory_limit_bytes))
         .arg(format!("--rlimit-cpu={}", cpu_time_limit)) // Limits actual CPU usage
         .arg("--rlimit-nproc=10")
         .arg("--rlimit-fsize=10000000")
@@ -130,15 +155,5 @@ pub fn run_sandboxed_tests(
     let exit_code = status.code().unwrap_or(-1);
 
     // Parse test results from stdout
-    let (tests_passed, tests_total) = TEST_RESULTS_PATTERN
-        .captures(&stdout_str)
-        .map(|caps| {
-            let passed = caps[1].parse::<i32>().unwrap_or(0);
-            let total = caps[2].parse::<i32>().unwrap_or(0);
-            (passed, total)
-        })
-        .unwrap_or((0, 0));
-
-    let all_passed = exit_code == 0 && tests_passed == tests_total && tests_total > 0;
-    Ok((all_passed, tests_passed, tests_total))
+    Ok(parse_test_results(&stdout_str, exit_code))
 }
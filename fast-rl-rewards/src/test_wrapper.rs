@@ -31,13 +31,52 @@
 //! exit(0 if _passed == _total else 1)
 //! ```
 
-use once_cell::sync::Lazy;
 use pyo3::prelude::*;
-use regex::Regex;
 
-static ASSERT_PATTERN: Lazy<Regex> = Lazy::new(|| Regex::new(r"(\s*)(assert\s+.+)").unwrap());
-static CHECK_DEF_PATTERN: Lazy<Regex> = Lazy::new(|| Regex::new(r"def\s+check\s*\(").unwrap());
-static INDENT_PATTERN: Lazy<Regex> = Lazy::new(|| Regex::new(r"^(\s*)").unwrap());
+const ASSERT_KEYWORD: &str = "assert";
+
+/// Check whether the text right after an `assert` keyword completes `assert\s+.+`:
+/// at least one whitespace character, then at least one character other than `\n`.
+fn completes_assertion(rest: &str) -> bool {
+    let mut chars = rest.chars();
+    chars.next().is_some_and(char::is_whitespace) && chars.any(|c| c != '\n')
+}
+
+/// Check whether `text` contains an assertion anywhere (`\s*assert\s+.+`).
+fn contains_assertion(text: &str) -> bool {
+    text.match_indices(ASSERT_KEYWORD)
+        .any(|(pos, _)| completes_assertion(&text[pos + ASSERT_KEYWORD.len()..]))
+}
+
+/// Find the first assertion in a line.
+///
+/// Equivalent to the leftmost match of `(\s*)(assert\s+.+)`: returns the whitespace run
+/// directly before `assert` (indent) and everything from `assert` to the end of the line.
+fn find_assertion(line: &str) -> Option<(&str, &str)> {
+    line.match_indices(ASSERT_KEYWORD)
+        .find(|&(pos, _)| completes_assertion(&line[pos + ASSERT_KEYWORD.len()..]))
+        .map(|(pos, _)| {
+            let indent_start = line[..pos].trim_end().len();
+            (&line[indent_start..pos], &line[pos..])
+        })
+}
+
+/// Check whether a line contains a check function definition (`def\s+check\s*\(`).
+fn is_check_definition(line: &str) -> bool {
+    line.match_indices("def").any(|(pos, _)| {
+        let rest = &line[pos + 3..];
+        let name = rest.trim_start();
+        name.len() < rest.len()
+            && name
+                .strip_prefix("check")
+                .is_some_and(|args| args.trim_start().starts_with('('))
+    })
+}
+
+/// Leading whitespace of a line.
+fn leading_whitespace(line: &str) -> &str {
+    &line[..line.len() - line.trim_start().len()]
+}
 
 /// # Arguments:
 /// - `test_code`: Original test function (usually "def check(candidate): ...")
@@ -45,15 +84,18 @@ static INDENT_PATTERN: Lazy<Regex> = Lazy::new(|| Regex::new(r"^(\s*)").unwrap()
 ///
 /// # Returns:
 /// Transformed test code that runs all tests and prints "TEST_PASSED:X/Y"
-#[pyfunction]
+///
+/// Lines are classified with plain substring scans (no regex engine): each line is
+/// searched for the `def`/`assert` literals and the surrounding whitespace rules are
+/// checked by hand.
 pub fn wrap_tests_for_complete_execution(test_code: &str, entry_point: &str) -> String {
     // Early return if no assertions to wrap
-    if !ASSERT_PATTERN.is_match(test_code) {
+    if !contains_assertion(test_code) {
         return test_code.to_string();
     }
 
     let lines: Vec<&str> = test_code.split('\n').collect();
-    let assert_count = ASSERT_PATTERN.find_iter(test_code).count();
+    let assert_count = test_code.matches(ASSERT_KEYWORD).count();
 
     // Pre-allocate capacity for better performance.
     //
@@ -71,17 +113,15 @@ pub fn wrap_tests_for_complete_execution(test_code: &str, entry_point: &str) ->
     // Additional overhead: ~10 lines for initialization, return, and reporting code
     let mut wrapped_lines: Vec<String> = Vec::with_capacity(lines.len() + assert_count * 4 + 10);
     let mut in_check_function = false;
-    let mut check_function_indent = String::new();
+    let mut check_function_indent = "";
 
     for line in lines {
         // 1. Detect check function definition
-        if CHECK_DEF_PATTERN.is_match(line) {
+        if is_check_definition(line) {
             in_check_function = true;
 
             // Extract indentation level
-            if let Some(caps) = INDENT_PATTERN.captures(line) {
-                check_function_indent = caps[1].to_string();
-            }
+            check_function_indent = leading_whitespace(line);
 
             wrapped_lines.push(line.to_string());
             wrapped_lines.push(format!("{}    _results = []", check_function_indent));
@@ -89,11 +129,8 @@ pub fn wrap_tests_for_complete_execution(test_code: &str, entry_point: &str) ->
         }
 
         // 2. Wrap assertions in try/except blocks
-        if let Some(caps) = ASSERT_PATTERN.captures(line) {
+        if let Some((indent, assertion)) = find_assertion(line) {
             if in_check_function {
-                let indent = &caps[1];
-                let assertion = &caps[2];
-
                 wrapped_lines.push(format!("{}try:", indent));
                 wrapped_lines.push(format!("{}    {}", indent, assertion));
                 wrapped_lines.push(format!("{}    _results.append(True)", indent));
@@ -109,9 +146,9 @@ pub fn wrap_tests_for_complete_execution(test_code: &str, entry_point: &str) ->
 
             // Function ends when we dedent or hit empty line
             let function_ended = trimmed.is_empty()
-                || (!trimmed.is_empty()
-                    && !line.starts_with(&format!("{} ", check_function_indent))
-                    && !line.starts_with(&format!("{}\t", check_function_indent)));
+                || !line
+                    .strip_prefix(check_function_indent)
+                    .is_some_and(|body| body.starts_with([' ', '\t']));
 
             if function_ended {
                 // Add return statement before exiting function
@@ -148,3 +185,27 @@ pub fn wrap_tests_for_complete_execution(test_code: &str, entry_point: &str) ->
 
     wrapped_lines.join("\n")
 }
+
+/// Python binding for [`wrap_tests_for_complete_execution`].
+///
+/// Releases the GIL while wrapping so that Python threads can wrap in parallel.
+#[pyfunction]
+#[pyo3(name = "wrap_tests_for_complete_execution")]
+pub fn py_wrap_tests_for_complete_execution(
+    py: Python,
+    test_code: &str,
+    entry_point: &str,
+) -> String {
+    py.detach(|| wrap_tests_for_complete_execution(test_code, entry_point))
+}
+
+/// Check whether wrapping `test_code` produces exactly `expected`.
+///
+/// Compares inside Rust against a borrowed view of the Python string, so the wrapped
+/// output is never copied back into a Python `str`. Used to validate reference
+/// implementations on large datasets, where almost every sample matches.
+/// Releases the GIL while wrapping and comparing.
+#[pyfunction]
+pub fn wrapped_tests_match(py: Python, test_code: &str, entry_point: &str, expected: &str) -> bool {
+    py.detach(|| wrap_tests_for_complete_execution(test_code, entry_point) == expected)
+}
@@ -0,0 +1,243 @@
+"""
+Persistent sandbox worker (see src/worker_pool.rs)
+
+Started once inside Firejail as `python3 -u -c <this file> TIMEOUT MEMORY_BYTES CPU_SECONDS`.
+Reads `seq | len | code` frames from stdin and, for each one, forks a fresh child that
+applies the resource limits and executes the program. Replies on stdout with
+`seq | len | "<exit_code>\n<program stdout>"`, echoing the program's sequence number.
+
+Untrusted code never runs in this process. Each child also gets a fresh working
+directory (deleted afterwards) and no cwd entry on sys.path, and everything it
+started is killed when it exits, so nothing a program does can leak into the
+next one. Only the interpreter startup and the imports below are shared.
+
+The worker is not dumpable, so programs (same uid) cannot open its stdin/stdout through
+/proc/<worker>/fd and inject frames into the protocol.
+"""
+import ctypes
+import os
+import resource
+import select
+import shutil
+import signal
+import sys
+import tempfile
+import time
+
+# Warm the modules generated solutions commonly import; forked children inherit them
+import bisect
+import collections
+import functools
+import heapq
+import itertools
+import math
+import re
+import string
+import typing
+
+TIMEOUT = float(sys.argv[1])
+MEMORY_BYTES = int(sys.argv[2])
+CPU_SECONDS = int(sys.argv[3])
+MAX_PROCESSES = 10
+MAX_FILE_BYTES = 10_000_000
+# Per-program working directories live in the sandbox's private home
+WORKDIR_ROOT = os.getcwd()
+
+PR_SET_DUMPABLE = 4
+PR_SET_CHILD_SUBREAPER = 36
+libc = ctypes.CDLL(None, use_errno=True)
+
+# Makes /proc/<worker>/fd (and ptrace) inaccessible to the programs it runs; must
+# succeed, otherwise a program could write forged replies to the host
+if libc.prctl(PR_SET_DUMPABLE, 0, 0, 0, 0) != 0:
+    sys.exit(f"prctl(PR_SET_DUMPABLE) failed: {os.strerror(ctypes.get_errno())}")
+
+# Orphans of a program (e.g. daemons that left its process group) are re-parented
+# to this worker, so they can be found and killed after the program exits
+libc.prctl(PR_SET_CHILD_SUBREAPER, 1, 0, 0, 0)
+
+
+def read_exact(n):
+    buf = bytearray()
+    while len(buf) < n:
+        chunk = os.read(0, n - len(buf))
+        if not chunk:
+            # Host closed the pipe: pool is shutting down
+            os._exit(0)
+        buf += chunk
+    return bytes(buf)
+
+
+def write_reply(seq, payload):
+    data = memoryview(seq + len(payload).to_bytes(4, "big") + payload)
+    while data:
+        data = data[os.write(1, data):]
+
+
+def set_limit(kind, value):
+    _, hard = resource.getrlimit(kind)
+    if hard != resource.RLIM_INFINITY:
+        value = min(value, hard)
+    resource.setrlimit(kind, (value, value))
+
+
+def run_child(code, workdir):
+    """Runs in the forked child; never returns"""
+    # New process group so everything the program spawns can be killed with it
+    os.setsid()
+    os.dup2(os.open(os.devnull, os.O_RDWR), 0)
+    # Files written by one program must not be importable by the next one
+    os.chdir(workdir)
+    sys.path[:] = [path for path in sys.path if path]
+    set_limit(resource.RLIMIT_AS, MEMORY_BYTES)
+    set_limit(resource.RLIMIT_CPU, CPU_SECONDS)
+    set_limit(resource.RLIMIT_NPROC, MAX_PROCESSES)
+    set_limit(resource.RLIMIT_FSIZE, MAX_FILE_BYTES)
+
+    # Same exit status `python3 file.py` would produce
+    status = 0
+    try:
+        exec(compile(code, "<completion>", "exec"), {"__name__": "__main__"})
+    except SystemExit as e:
+        if e.code is None:
+            status = 0
+        elif isinstance(e.code, int):
+            status = e.code
+        else:
+            status = 1
+    except BaseException:
+        status = 1
+
+    try:
+        sys.stdout.flush()
+    except BaseException:
+        pass
+    os._exit(status & 0xFF)
+
+
+def has_exited(pid):
+    """True once `pid` has exited; leaves it unreaped so its pid stays reserved"""
+    return os.waitid(os.P_PID, pid, os.WEXITED | os.WNOHANG | os.WNOWAIT) is not None
+
+
+def group_exists(pgid):
+    try:
+        os.killpg(pgid, 0)
+        return True
+    except ProcessLookupError:
+        return False
+
+
+def own_children():
+    me = os.getpid()
+    children = []
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                stat = f.read()
+        except OSError:
+            continue
+        # Fields after the parenthesised command name: state, ppid, ...
+        if int(stat.rsplit(")", 1)[1].split()[1]) == me:
+            children.append(int(entry))
+    return children
+
+
+def kill_program(pid):
+    """Kill the program and everything it started; returns its exit code"""
+    try:
+        os.killpg(pid, signal.SIGKILL)
+    except ProcessLookupError:
+        # Child has not reached setsid() yet
+        os.kill(pid, signal.SIGKILL)
+    exit_code = os.waitstatus_to_exitcode(os.waitpid(pid, 0)[1])
+
+    # Processes that left the group are re-parented here once their parents die, so
+    # keep killing this worker's children until neither they nor the group remain
+    while True:
+        children = own_children()
+        for child in children:
+            try:
+                os.kill(child, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+        for child in children:
+            try:
+                os.waitpid(child, 0)
+            except ChildProcessError:
+                pass
+        if not children:
+            if not group_exists(pid):
+                return exit_code
+            time.sleep(0.001)
+
+
+def open_exit_fd(pid):
+    """pidfd that becomes readable when `pid` exits, or None where unsupported"""
+    try:
+        return os.pidfd_open(pid)
+    except (AttributeError, OSError):
+        return None
+
+
+def run(code):
+    """Execute one program in a forked child; returns (exit_code, stdout)"""
+    workdir = tempfile.mkdtemp(prefix="completion-", dir=WORKDIR_ROOT)
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.close(read_fd)
+        os.dup2(write_fd, 1)
+        os.close(write_fd)
+        run_child(code, workdir)
+
+    os.close(write_fd)
+    exit_fd = open_exit_fd(pid)
+    deadline = time.monotonic() + TIMEOUT
+    output = bytearray()
+    pipe_open = True
+    timed_out = False
+
+    # Wait for the program to exit rather than for EOF: processes it left in the
+    # background may hold the pipe open
+    while not has_exited(pid):
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            timed_out = True
+            break
+        watched = [read_fd] if pipe_open else []
+        if exit_fd is not None:
+            watched.append(exit_fd)
+        else:
+            # No pidfd: wake up periodically to check for exit
+            remaining = min(remaining, 0.001)
+        if read_fd in select.select(watched, [], [], remaining)[0]:
+            chunk = os.read(read_fd, 65536)
+            output += chunk
+            pipe_open = bool(chunk)
+
+    # With every writer killed, the rest of the output is already in the pipe
+    exit_code = kill_program(pid)
+    while pipe_open and not timed_out and select.select([read_fd], [], [], 0)[0]:
+        chunk = os.read(read_fd, 65536)
+        output += chunk
+        pipe_open = bool(chunk)
+    os.close(read_fd)
+    if exit_fd is not None:
+        os.close(exit_fd)
+    shutil.rmtree(workdir, ignore_errors=True)
+
+    if timed_out:
+        # Timeout exceeded - the program was killed
+        return -1, b""
+    return exit_code, bytes(output)
+
+
+while True:
+    seq = read_exact(8)
+    length = int.from_bytes(read_exact(4), "big")
+    code = read_exact(length).decode("utf-8", "replace")
+    exit_code, output = run(code)
+    write_reply(seq, str(exit_code).encode() + b"\n" + output)
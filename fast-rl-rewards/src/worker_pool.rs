@@ -0,0 +1,222 @@
+//! src/worker_pool.rs
+//!
+//! Persistent pool of sandboxed Python workers.
+//!
+//! Spawning `firejail python3` for every completion is dominated by sandbox setup and
+//! interpreter startup, not by the tests themselves. The pool starts each worker once
+//! inside Firejail and streams programs to it over stdin/stdout, so that cost is paid
+//! once per worker instead of once per completion.
+//!
+//! # Isolation
+//! A worker never executes untrusted code in its own interpreter: for every program it
+//! forks a fresh child, applies the resource limits there and kills it on timeout
+//! (see `worker_loop.py`). Anything a completion changes (builtins, modules, globals)
+//! dies with its child. Unlike a one-shot sandbox, the worker's filesystem and process
+//! table outlive each program, so the worker also:
+//! - runs every program in a fresh working directory, deleted afterwards, with the
+//!   current directory removed from `sys.path` (written files cannot shadow imports)
+//! - kills the program's process group, and any process that left it, as soon as the
+//!   program exits (background processes cannot outlive it)
+//! - is not dumpable, so programs cannot open its stdin/stdout via `/proc` and write
+//!   frames into the protocol
+//!
+//! # Protocol
+//! - Host -> worker: `seq: u64 | len: u32 | code: [u8; len]`
+//! - Worker -> host: `seq: u64 | len: u32 | "<exit_code>\n<stdout>"`
+//!
+//! Integers are big-endian. The worker echoes each program's sequence number; the host
+//! discards a worker whose reply carries the wrong one, or that sends an extra reply, so
+//! a worker that got out of step cannot hand one program's result to another.
+//!
+//! The worker enforces the per-program timeout itself, but it runs inside the sandbox
+//! and a program can interfere with it (e.g. `SIGSTOP` its parent). The host therefore
+//! waits at most `timeout_seconds` plus [`REPLY_MARGIN`] for a reply and discards the
+//! worker when none arrives.
+
+use crate::sandbox::{firejail_command, parse_test_results};
+use anyhow::{Context, Result, bail, ensure};
+use std::collections::hash_map::RandomState;
+use std::hash::BuildHasher;
+use std::io::{self, Read, Write};
+use std::process::{Child, ChildStdin, ChildStdout, Stdio};
+use std::sync::mpsc::{self, Receiver, RecvTimeoutError, Sender, TryRecvError};
+use std::sync::{Mutex, MutexGuard, PoisonError};
+use std::thread;
+use std::time::Duration;
+
+/// Worker main loop, passed to `python3 -c`.
+const WORKER_LOOP: &str = include_str!("worker_loop.py");
+
+/// Time allowed on top of `timeout_seconds` for the worker to fork, clean up and reply.
+const REPLY_MARGIN: Duration = Duration::from_secs(5);
+
+/// A long-lived sandboxed Python process.
+struct PyWorker {
+    child: Child,
+    stdin: ChildStdin,
+    /// `(seq, payload)` replies read from the worker's stdout by a background thread, so
+    /// waiting for one can time out.
+    replies: Receiver<io::Result<(u64, Vec<u8>)>>,
+    /// Sequence number of the next program.
+    next_seq: u64,
+}
+
+impl PyWorker {
+    fn spawn(timeout_seconds: u64, memory_limit_mb: u64, cpu_time_limit: u64) -> Result<Self> {
+        // Resource limits are applied per program inside the worker, not to the worker
+        // itself, so its own CPU time does not accumulate towards `cpu_time_limit`.
+        let mut cmd = firejail_command();
+        cmd.arg("python3")
+            .arg("-u") // Unbuffered output
+            .arg("-c")
+            .arg(WORKER_LOOP)
+            .arg(timeout_seconds.to_string())
+            .arg((memory_limit_mb * 1_000_000).to_string())
+            .arg(cpu_time_limit.to_string())
+            .stdin(Stdio::piped())
+            .stdout(Stdio::piped())
+            .stderr(Stdio::null()) // Ignore stderr (reduces noise)
+            .env("PYTHONPATH", ""); // Clean environment
+
+        let mut child = cmd
+            .spawn()
+            .context("Failed to spawn firejail worker. Is firejail installed?")?;
+        let stdin = child.stdin.take().context("Failed to take worker stdin")?;
+        let stdout = child
+            .stdout
+            .take()
+            .context("Failed to take worker stdout")?;
+
+        let (sender, replies) = mpsc::channel();
+        thread::spawn(move || read_replies(stdout, sender));
+
+        Ok(Self {
+            child,
+            stdin,
+            replies,
+            // Random start, so a program cannot predict the sequence number of its reply
+            next_seq: RandomState::new().hash_one(()),
+        })
+    }
+
+    /// Whether the worker is alive and has no reply that no program is waiting for.
+    fn is_in_step(&self) -> bool {
+        matches!(self.replies.try_recv(), Err(TryRecvError::Empty))
+    }
+
+    /// Send one program and wait up to `timeout` for its `(exit_code, stdout)`.
+    ///
+    /// Returns `Ok(None)` if no reply arrived in time; the worker must then be discarded.
+    fn run(&mut self, code: &str, timeout: Duration) -> Result<Option<(i32, String)>> {
+        let len = u32::try_from(code.len()).context("Program too large for worker protocol")?;
+        let seq = self.next_seq;
+        self.next_seq = seq.wrapping_add(1);
+        self.stdin.write_all(&seq.to_be_bytes())?;
+        self.stdin.write_all(&len.to_be_bytes())?;
+        self.stdin.write_all(code.as_bytes())?;
+        self.stdin.flush()?;
+
+        let (reply_seq, reply) = match self.replies.recv_timeout(timeout) {
+            Ok(reply) => reply.context("Worker exited unexpectedly")?,
+            Err(RecvTimeoutError::Timeout) => return Ok(None),
+            Err(RecvTimeoutError::Disconnected) => bail!("Worker exited unexpectedly"),
+        };
+        ensure!(reply_seq == seq, "Worker reply out of sequence");
+
+        let reply = String::from_utf8_lossy(&reply);
+        let (exit_code, stdout) = reply.split_once('\n').context("Malformed worker reply")?;
+        let exit_code = exit_code.parse().context("Malformed worker exit code")?;
+        Ok(Some((exit_code, stdout.to_string())))
+    }
+}
+
+/// Forward replies from `stdout` until the worker exits or is dropped.
+fn read_replies(mut stdout: ChildStdout, replies: Sender<io::Result<(u64, Vec<u8>)>>) {
+    loop {
+        let reply = read_reply(&mut stdout);
+        let failed = reply.is_err();
+        if replies.send(reply).is_err() || failed {
+            return;
+        }
+    }
+}
+
+fn read_reply(stdout: &mut ChildStdout) -> io::Result<(u64, Vec<u8>)> {
+    let mut seq_buf = [0u8; 8];
+    stdout.read_exact(&mut seq_buf)?;
+    let mut len_buf = [0u8; 4];
+    stdout.read_exact(&mut len_buf)?;
+    let mut reply = vec![0u8; u32::from_be_bytes(len_buf) as usize];
+    stdout.read_exact(&mut reply)?;
+    Ok((u64::from_be_bytes(seq_buf), reply))
+}
+
+impl Drop for PyWorker {
+    fn drop(&mut self) {
+        let _ = self.child.kill();
+        let _ = self.child.wait();
+    }
+}
+
+/// Pool of persistent sandboxed Python workers.
+///
+/// Workers are spawned lazily: each concurrent caller (one per Rayon thread) checks out
+/// an idle worker or starts a new one, and returns it afterwards. The pool therefore
+/// grows to the evaluation parallelism and stays warm across batches.
+pub struct PyWorkerPool {
+    idle: Mutex<Vec<PyWorker>>,
+    timeout_seconds: u64,
+    memory_limit_mb: u64,
+    cpu_time_limit: u64,
+}
+
+impl PyWorkerPool {
+    pub fn new(timeout_seconds: u64, memory_limit_mb: u64, cpu_time_limit: u64) -> Self {
+        Self {
+            idle: Mutex::new(Vec::new()),
+            timeout_seconds,
+            memory_limit_mb,
+            cpu_time_limit,
+        }
+    }
+
+    /// Execute Python code with tests on a pooled worker.
+    ///
+    /// Same contract as [`crate::sandbox::run_sandboxed_tests`]: returns
+    /// `(all_passed, tests_passed, tests_total)`, with `(false, 0, 0)` on timeout.
+    /// A worker that fails mid-protocol or replies out of sequence is discarded and the
+    /// error returned; one that does not reply within the deadline is discarded and
+    /// counts as a timeout.
+    pub fn run_tests(&self, code: &str) -> Result<(bool, i32, i32)> {
+        // Early return for empty code
+        if code.trim().is_empty() {
+            return Ok((false, 0, 0));
+        }
+
+        // Dropping a worker kills it; one with a stray reply (e.g. the real one, after a
+        // forged reply was accepted for the previous program) is out of step
+        let idle_worker = std::iter::from_fn(|| self.lock_idle().pop()).find(PyWorker::is_in_step);
+        let mut worker = match idle_worker {
+            Some(worker) => worker,
+            None => PyWorker::spawn(
+                self.timeout_seconds,
+                self.memory_limit_mb,
+                self.cpu_time_limit,
+            )?,
+        };
+
+        let deadline = Duration::from_secs(self.timeout_seconds) + REPLY_MARGIN;
+        let Some((exit_code, stdout)) = worker.run(code, deadline)? else {
+            // Dropping the worker kills it
+            return Ok((false, 0, 0));
+        };
+        self.lock_idle().push(worker);
+
+        Ok(parse_test_results(&stdout, exit_code))
+    }
+
+    fn lock_idle(&self) -> MutexGuard<'_, Vec<PyWorker>> {
+        // A panic while holding the lock cannot leave the Vec inconsistent
+        self.idle.lock().unwrap_or_else(PoisonError::into_inner)
+    }
+}
@@ -2,9 +2,13 @@
 """
 Compare Python vs Rust reward evaluation on real Code-R1 data
 """
+import queue
 import sys
+import threading
 import time
-from datasets import load_dataset
+
+import numpy as np
+from coder1_dataset import get_filtered_coder1, has_tests_and_completion, sample_rows
 
 # Import Rust implementation
 try:
@@ -20,9 +24,47 @@ from train_grpo_coder1 import (
     CONFIG
 )
 
-def benchmark_comparison(num_samples=50):
+# Columns the execution reward reads; everything else in the dataset is left in Arrow
+REWARD_COLUMNS = ['completion', 'test', 'entry_point']
+
+def prefetch_batches(dataset, batch_size=32, prefetch=8):
+    """
+    Stream batches of sample dicts decoded by a background thread
+
+    A daemon thread slices the dataset's Arrow table `batch_size` rows at a
+    time and keeps up to `prefetch` batches queued, so decoding the next batch
+    overlaps with Rust evaluating the current one (which releases the GIL).
+    Only `REWARD_COLUMNS` are converted to Python objects.
+    """
+    tables = dataset.with_format("arrow").iter(batch_size=batch_size)
+    batches = queue.Queue(maxsize=prefetch)
+    
+    def producer():
+        try:
+            for table in tables:
+                batches.put(table.select(REWARD_COLUMNS).to_pylist())
+            batches.put(None)
+        except Exception as e:
+            batches.put(e)
+    
+    threading.Thread(target=producer, daemon=True).start()
+    
+    while (batch := batches.get()) is not None:
+        if isinstance(batch, Exception):
+            raise batch
+        yield batch
+
+def benchmark_comparison(num_samples=50, batch_size=32, prefetch=8, warmup=None,
+                         persistent_workers=True):
     """
-    Compare Python (parallel) vs Rust (sequential) on real dataset
+    Compare Python (ProcessPoolExecutor) vs Rust (Rayon) on real dataset
+    
+    The Rust side consumes the dataset as a prefetched stream of `batch_size`
+    sample dicts, passed row-wise instead of as three parallel lists. With
+    `persistent_workers` it runs tests on a pool of sandbox workers that stay
+    warm across batches instead of starting Firejail + Python per sample. Both
+    sides are called once on `warmup` samples before timing; by default 2, or
+    one full batch with persistent workers so every pooled worker is running.
     """
     print("\n" + "="*80)
     print("BENCHMARKING: Python vs Rust Reward Evaluation")
@@ -31,28 +73,22 @@ def benchmark_comparison(num_samples=50):
     # Disable debug mode
     CONFIG.debug_mode = False
     
-    # Load dataset
+    # Load dataset (filtered subset is cached on disk after the first run)
     print("Loading Code-R1 dataset...")
-    dataset = load_dataset("ganler/code-r1-12k", split="train")
     
     # Filter: must have test, entry_point, AND completion
-    dataset = dataset.filter(
-        lambda x: x['test'] is not None 
-        and x['test'] != 'null'
-        and x['entry_point'] is not None
-        and x['entry_point'] != 'null'
-        and x['completion'] is not None  # ← KEY: Must have completion!
-        and x['completion'] != 'null'
-    )
+    dataset = get_filtered_coder1(has_tests_and_completion)
     
     print(f"Filtered to {len(dataset)} samples with completions")
-    test_dataset = dataset.shuffle(seed=42).select(range(num_samples))
+    test_dataset = sample_rows(dataset, num_samples, seed=42)
     print(f"Selected {num_samples} samples for testing\n")
     
-    # Use REAL completions from dataset
-    completions = [sample['completion'] for sample in test_dataset]
-    tests = [sample['test'] for sample in test_dataset]
-    entry_points = [sample['entry_point'] for sample in test_dataset]
+    # Use REAL completions from dataset, read column-wise from Arrow so no
+    # per-row dict of every column is built
+    table = test_dataset.with_format("arrow")[:]
+    completions, tests, entry_points = (
+        table.column(name).to_pylist() for name in REWARD_COLUMNS
+    )
     
     # Show sample
     print("Sample completion (first 200 chars):")
@@ -63,6 +99,22 @@ def benchmark_comparison(num_samples=50):
         'entry_point': entry_points,
     }
     
+    # Same evaluator for warmup and timing, so pooled workers started during
+    # warmup are reused by the timed run
+    evaluator = fastrlrewards.RewardEvaluator(persistent_workers=persistent_workers)
+    
+    # Warm up both sides untimed so one-off costs (process pool fork, Rayon
+    # thread spawn, first page faults) are excluded. Pooled sandbox workers
+    # start lazily, one per concurrent task, so with them the warmup covers a
+    # full batch; one-shot sandboxes have nothing to warm, so 2 samples suffice
+    if warmup is None:
+        warmup = min(batch_size, num_samples) if persistent_workers else 2
+    if warmup > 0:
+        print(f"Warming up on {warmup} samples...\n")
+        warmup_samples = table.slice(0, warmup).select(REWARD_COLUMNS).to_pylist()
+        py_execution_reward(completions[:warmup], test=tests[:warmup], entry_point=entry_points[:warmup])
+        evaluator.execution_reward_dict_batch(warmup_samples)
+    
     # Benchmark Python (with ProcessPoolExecutor)
     print("Running Python execution_reward (ProcessPoolExecutor)...")
     start = time.time()
@@ -70,30 +122,37 @@ def benchmark_comparison(num_samples=50):
     py_time = time.time() - start
     print(f"Python completed in {py_time:.2f}s\n")
     
-    # Benchmark Rust (single-threaded)
-    print("Running Rust execution_reward (single-threaded)...")
+    # Benchmark Rust (Rayon thread pool, GIL released) on a prefetched stream
+    workers = "persistent" if persistent_workers else "one-shot"
+    print(f"Running Rust execution_reward (Rayon, batch={batch_size}, prefetch={prefetch}, {workers} workers)...")
     start = time.time()
-    rust_rewards = fastrlrewards.execution_reward(completions, **kwargs)
+    rust_rewards = []
+    for batch in prefetch_batches(test_dataset, batch_size, prefetch):
+        rust_rewards.extend(evaluator.execution_reward_dict_batch(batch))
     rust_time = time.time() - start
     print(f"Rust completed in {rust_time:.2f}s\n")
     
-    # Compare results
-    matches = sum(1 for p, r in zip(py_rewards, rust_rewards) if abs(p - r) < 0.01)
-    py_pass = sum(py_rewards)
-    rust_pass = sum(rust_rewards)
+    # Compare results (rewards are 0.0/1.0, so float32 is exact)
+    py_arr = np.asarray(py_rewards, dtype=np.float32)
+    rust_arr = np.asarray(rust_rewards, dtype=np.float32)
+    mismatched = np.abs(py_arr - rust_arr) >= 0.01
+    matches = int(num_samples - np.count_nonzero(mismatched))
+    py_pass = float(py_arr.sum())
+    rust_pass = float(rust_arr.sum())
     
     # Results
     print("="*80)
     print("BENCHMARK RESULTS")
     print("="*80)
     print(f"Samples tested:              {num_samples}")
-    print(f"Python time (parallel):      {py_time:.2f}s")
-    print(f"Rust time (sequential):      {rust_time:.2f}s")
+    print(f"Python time (processes):     {py_time:.2f}s")
+    print(f"Rust time (Rayon):           {rust_time:.2f}s")
+    print(f"Rust sandbox workers:        {workers}")
     
     if rust_time < py_time:
         print(f"Speedup:                     {py_time/rust_time:.2f}x FASTER ✓")
     else:
-        print(f"Speedup:                     {py_time/rust_time:.2f}x (SLOWER - expected for sequential)")
+        print(f"Speedup:                     {py_time/rust_time:.2f}x (SLOWER)")
     
     print(f"Results match:               {matches}/{num_samples} ({matches/num_samples*100:.1f}%)")
     print(f"Python: {int(py_pass)} tests passed")
@@ -109,24 +168,19 @@ def benchmark_comparison(num_samples=50):
     else:
         print(f"✗ WARNING: {num_samples - matches} mismatches detected!")
         print("\nFirst few mismatches:")
-        shown = 0
-        for i, (p, r) in enumerate(zip(py_rewards, rust_rewards)):
-            if abs(p - r) >= 0.01 and shown < 5:
-                print(f"  Sample {i}: Python={p:.3f}, Rust={r:.3f}")
-                shown += 1
+        for i in np.flatnonzero(mismatched)[:5]:
+            print(f"  Sample {i}: Python={py_arr[i]:.3f}, Rust={rust_arr[i]:.3f}")
     
     print("\n" + "="*80)
     print("INTERPRETATION")
     print("="*80)
     if matches == num_samples:
+        print("✓ Correctness validated")
         if rust_time > py_time:
-            print("✓ Correctness validated")
-            print("⚠ Sequential Rust is slower than parallel Python (expected)")
-            print("→ Next step: Add Rayon parallelization to Rust")
-            print(f"→ Target: <{py_time:.1f}s with parallel Rust")
+            print("⚠ Rayon Rust is slower than ProcessPoolExecutor Python")
+            print("→ Check the Rayon thread count (RewardEvaluator(num_threads=...))")
         else:
-            print("✓ Correctness validated")
-            print("✓ Already faster! (unexpected but good)")
+            print("✓ Rayon Rust is faster than ProcessPoolExecutor Python")
     else:
         print("✗ Fix correctness issues before proceeding")
     print("="*80 + "\n")
@@ -143,6 +197,8 @@ def test_format_reward(num_samples=20):
         "<think>x</think>\n<answer>y</answer>",  # Valid
     ] * (num_samples // 3)
     
+    # Both sides receive the whole list in one call: the Python reward is
+    # list-in/list-out, and the Rust one crosses the PyO3 boundary once
     start = time.time()
     py_rewards = py_format_reward(completions)
     py_time = time.time() - start
@@ -169,6 +225,13 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description='Benchmark Python vs Rust rewards')
     parser.add_argument('--samples', type=int, default=50, help='Number of samples to test')
     parser.add_argument('--format-only', action='store_true', help='Only test format_reward')
+    parser.add_argument('--batch-size', type=int, default=32, help='Samples per Rust call')
+    parser.add_argument('--prefetch', type=int, default=8, help='Batches decoded ahead of Rust')
+    parser.add_argument('--warmup', type=int, default=None,
+                        help='Untimed samples run before timing (default: 2, or one batch with '
+                             '--persistent-workers so every pooled worker starts before timing)')
+    parser.add_argument('--persistent-workers', action=argparse.BooleanOptionalAction, default=True,
+                        help='Run Rust tests on pooled sandbox workers instead of one process per sample')
     
     args = parser.parse_args()
     
@@ -177,4 +240,5 @@ if __name__ == "__main__":
     else:
         # Test both
         test_format_reward()
-        benchmark_comparison(args.samples)
+        benchmark_comparison(args.samples, args.batch_size, args.prefetch, args.warmup,
+                             args.persistent_workers)
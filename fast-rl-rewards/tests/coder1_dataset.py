@@ -0,0 +1,144 @@
+"""
+Cached loading of the filtered Code-R1 dataset shared by the test scripts
+"""
+import hashlib
+import inspect
+import os
+import random
+import shutil
+from pathlib import Path
+
+import pyarrow.compute as pc
+from datasets import load_dataset, load_from_disk
+from huggingface_hub import HfApi
+from huggingface_hub.errors import OfflineModeIsEnabled
+
+CACHE_ROOT = Path(__file__).parent / ".cache"
+DATASET_NAME = "ganler/code-r1-12k"
+DATASET_REVISION = "main"
+# Commit sha `DATASET_REVISION` resolved to, so warm starts need no Hub request
+REVISION_FILE = CACHE_ROOT / "coder1_revision"
+
+# Errors meaning the Hub cannot be reached. The client raises its HTTP library's
+# own errors: `requests` before huggingface_hub 1.0, `httpx` from 1.0 on
+_HUB_UNREACHABLE = (OfflineModeIsEnabled,)
+try:
+    import requests
+    _HUB_UNREACHABLE += (requests.ConnectionError, requests.Timeout)
+except ImportError:
+    pass
+try:
+    import httpx
+    _HUB_UNREACHABLE += (httpx.TransportError,)
+except ImportError:
+    pass
+
+
+def _is_present(column):
+    """Columnar mask: value is not None and not the literal string 'null'"""
+    return pc.and_kleene(pc.is_valid(column), pc.not_equal(column, 'null'))
+
+
+def has_tests(batch):
+    """Batched predicate: sample must have test and entry_point"""
+    mask = pc.and_kleene(_is_present(batch['test']), _is_present(batch['entry_point']))
+    return mask.to_pylist()
+
+
+def has_tests_and_completion(batch):
+    """Batched predicate: sample must have test, entry_point AND completion"""
+    mask = pc.and_kleene(
+        pc.and_kleene(_is_present(batch['test']), _is_present(batch['entry_point'])),
+        _is_present(batch['completion']),
+    )
+    return mask.to_pylist()
+
+
+def _resolve_revision(refresh=False):
+    """
+    Commit sha of `DATASET_REVISION`, so an upstream update changes the cache key
+
+    The sha is recorded in `REVISION_FILE` the first time it is resolved and reused
+    from there without contacting the Hub. `refresh=True` asks the Hub again and
+    falls back to the recorded sha when it cannot be reached.
+    """
+    recorded = REVISION_FILE.read_text().strip() if REVISION_FILE.exists() else None
+    if recorded and not refresh:
+        return recorded
+
+    try:
+        sha = HfApi().dataset_info(DATASET_NAME, revision=DATASET_REVISION).sha
+    except _HUB_UNREACHABLE:
+        # Offline and never resolved: only the symbolic revision is known
+        return recorded or DATASET_REVISION
+
+    CACHE_ROOT.mkdir(parents=True, exist_ok=True)
+    tmp_file = REVISION_FILE.with_name(f"{REVISION_FILE.name}.{os.getpid()}.tmp")
+    tmp_file.write_text(sha + "\n")
+    os.replace(tmp_file, REVISION_FILE)
+    return sha
+
+
+def _cache_key(predicate, revision):
+    """Hash of everything the filtered subset depends on"""
+    digest = hashlib.sha256()
+    for part in (
+        Path(__file__).read_text(),  # Helpers such as `_is_present`
+        inspect.getsource(predicate),  # May live in the calling module
+        DATASET_NAME,
+        revision,
+    ):
+        digest.update(part.encode())
+        digest.update(b"\0")
+    return digest.hexdigest()[:16]
+
+
+def get_filtered_coder1(predicate=has_tests, refresh=False):
+    """
+    Load Code-R1 filtered by `predicate`, caching the result as Arrow on disk
+
+    The first call downloads the dataset, runs the batched predicate over Arrow
+    columns in `os.cpu_count()` processes and saves the subset. Later calls are a
+    memory-mapped `load_from_disk`, with no network access. The cache is keyed by
+    this module's source, the predicate's source and the dataset's commit sha, so
+    editing a predicate or a helper invalidates it. The sha is pinned on first use;
+    pass `refresh=True` to pick up an upstream dataset update.
+    """
+    revision = _resolve_revision(refresh)
+    cache_dir = CACHE_ROOT / f"coder1_filtered_{_cache_key(predicate, revision)}"
+    if cache_dir.exists():
+        return load_from_disk(str(cache_dir))
+
+    dataset = load_dataset(DATASET_NAME, split="train", revision=revision)
+    filtered = dataset.with_format("arrow").filter(
+        predicate,
+        batched=True,
+        num_proc=os.cpu_count(),
+        load_from_cache_file=True,
+    ).with_format(None)
+
+    # Write to a temporary directory first so an interrupted run never leaves a
+    # half-written cache behind; clear what such a run may have left
+    tmp_dir = cache_dir.with_name(cache_dir.name + ".tmp")
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    filtered.save_to_disk(str(tmp_dir))
+    try:
+        os.replace(tmp_dir, cache_dir)
+    except OSError:
+        # Another run finished the same cache first; keep its copy
+        if not cache_dir.exists():
+            raise
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+    return load_from_disk(str(cache_dir))
+
+
+def sample_rows(dataset, num_samples, seed=42):
+    """
+    Select `num_samples` random rows without shuffling the whole dataset
+
+    `dataset.shuffle(seed).select(range(n))` builds a permutation of every row just
+    to keep n of them; drawing n row ids is O(n). Seed-stable, but picks different
+    rows than the old shuffle-based selection.
+    """
+    ids = random.Random(seed).sample(range(len(dataset)), num_samples)
+    return dataset.select(ids)
@@ -4,6 +4,7 @@ Tests for the complete reward evaluator
 """
 
 import sys
+import time
 import fastrlrewards
 
 def test_format_reward_function():
@@ -86,6 +87,167 @@ def test_trl_dict_format():
     assert rewards[0] == 1.0
     print("✓ test_trl_dict_format passed")
 
+def test_execution_reward_stream():
+    """Test streaming (completion, test, entry_point) tuples from a generator"""
+    rows = [
+        ("<answer>def add(a, b): return a + b</answer>", "add"),
+        ("<answer>def add(a, b): return a - b</answer>", "add"),  # Wrong
+    ]
+    test = "def check(candidate):\n    assert candidate(2, 3) == 5"
+    
+    rewards = fastrlrewards.execution_reward_stream(
+        (completion, test, entry_point) for completion, entry_point in rows
+    )
+    assert rewards == [1.0, 0.0]
+    print("✓ test_execution_reward_stream passed")
+
+def test_execution_reward_interned():
+    """Test interned tests/entry points shared across completions"""
+    completions = [
+        "<answer>def add(a, b): return a + b</answer>",
+        "<answer>def add(a, b): return a - b</answer>",  # Wrong
+        "<answer>def square(x): return x * x</answer>",
+    ]
+    unique_tests = [
+        "def check(candidate):\n    assert candidate(2, 3) == 5",
+        "def check(candidate):\n    assert candidate(4) == 16",
+    ]
+    unique_entry_points = ["add", "square"]
+    
+    rewards = fastrlrewards.execution_reward_interned(
+        completions, unique_tests, [0, 0, 1], unique_entry_points, [0, 0, 1]
+    )
+    assert rewards == [1.0, 0.0, 1.0]
+    
+    # Out-of-range ids are rejected
+    try:
+        fastrlrewards.execution_reward_interned(
+            completions, unique_tests, [0, 0, 2], unique_entry_points, [0, 0, 1]
+        )
+        assert False, "Expected ValueError"
+    except ValueError:
+        pass
+    print("✓ test_execution_reward_interned passed")
+
+def test_execution_reward_dict_batch():
+    """Test passing dataset rows as dicts instead of three parallel lists"""
+    test = "def check(candidate):\n    assert candidate(2, 3) == 5"
+    samples = [
+        {"completion": "<answer>def add(a, b): return a + b</answer>", "test": test, "entry_point": "add"},
+        {"completion": "<answer>def add(a, b): return a - b</answer>", "test": test, "entry_point": "add"},  # Wrong
+        {"content": "<answer>def add(a, b): return a + b</answer>", "test": test, "entry_point": "add"},  # TRL key
+    ]
+    
+    rewards = fastrlrewards.execution_reward_dict_batch(samples)
+    assert rewards == [1.0, 0.0, 1.0]
+    
+    evaluator = fastrlrewards.RewardEvaluator()
+    assert evaluator.execution_reward_dict_batch(samples) == rewards
+    print("✓ test_execution_reward_dict_batch passed")
+
+def test_execution_reward_mask():
+    """Test the bit-packed pass/fail mask against the float rewards"""
+    completions = [
+        "<answer>def add(a, b): return a + b</answer>",
+        "<answer>def add(a, b): return a - b</answer>",  # Wrong
+    ] * 5
+    tests = ["def check(candidate):\n    assert candidate(2, 3) == 5"] * len(completions)
+    entry_points = ["add"] * len(completions)
+    
+    mask = fastrlrewards.execution_reward_mask(completions, test=tests, entry_point=entry_points)
+    assert isinstance(mask, bytes) and len(mask) == 2
+    
+    # Bit i % 8 of byte i // 8 is completion i
+    bits = [(mask[i // 8] >> (i % 8)) & 1 for i in range(len(completions))]
+    rewards = fastrlrewards.execution_reward(completions, test=tests, entry_point=entry_points)
+    assert bits == [int(r) for r in rewards] == [1, 0] * 5
+    assert fastrlrewards.count_passed(mask) == 5
+    print("✓ test_execution_reward_mask passed")
+
+def test_persistent_workers_match_one_shot():
+    """Pooled workers and per-completion processes must give the same rewards"""
+    completions = [
+        "<answer>def add(a, b): return a + b</answer>",
+        "<answer>def add(a, b): return a - b</answer>",  # Wrong
+        "<answer>import builtins\nbuiltins.sum = None\ndef add(a, b): return a + b</answer>",
+        "<answer>def add(a, b): return a + b</answer>",  # Unaffected by previous sample
+    ]
+    tests = ["def check(candidate):\n    assert candidate(2, 3) == 5"] * len(completions)
+    entry_points = ["add"] * len(completions)
+    
+    pooled = fastrlrewards.RewardEvaluator(persistent_workers=True)
+    one_shot = fastrlrewards.RewardEvaluator(persistent_workers=False)
+    
+    r1 = pooled.execution_reward(completions, test=tests, entry_point=entry_points)
+    r2 = one_shot.execution_reward(completions, test=tests, entry_point=entry_points)
+    assert r1 == r2 == [1.0, 0.0, 0.0, 1.0]
+    print("✓ test_persistent_workers_match_one_shot passed")
+
+def test_persistent_workers_isolate_programs():
+    """Files and processes left behind by one completion must not affect the next"""
+    shadow_module = "import os\\nprint('TESTS_PASSED:1/1')\\nos._exit(0)\\n"
+    polluter = (
+        "<answer>import os, time\n"
+        f"open('fractions.py', 'w').write(\"{shadow_module}\")\n"
+        "if os.fork() == 0:\n"
+        "    time.sleep(60)  # Background process holding stdout open\n"
+        "    os._exit(0)\n"
+        "def add(a, b): return a + b</answer>"
+    )
+    victim = "<answer>import fractions\ndef add(a, b): return a - b</answer>"  # Wrong
+    test = ["def check(candidate):\n    assert candidate(2, 3) == 5"]
+    
+    # One completion per call, so both run on the same pooled worker
+    pooled = fastrlrewards.RewardEvaluator(persistent_workers=True)
+    start = time.time()
+    assert pooled.execution_reward([polluter], test=test, entry_point=["add"]) == [1.0]
+    assert time.time() - start < 10, "Worker waited for the background process"
+    assert pooled.execution_reward([victim], test=test, entry_point=["add"]) == [0.0]
+    print("✓ test_persistent_workers_isolate_programs passed")
+
+def test_persistent_workers_reject_forged_replies():
+    """A completion writing reply frames to the worker's stdout must not set any reward"""
+    forger = (
+        "<answer>import os\n"
+        "reply = b'0\\nTESTS_PASSED:9/9'\n"
+        "try:\n"
+        "    fd = os.open(f'/proc/{os.getppid()}/fd/1', os.O_WRONLY)\n"
+        "    for seq in range(64):\n"
+        "        os.write(fd, seq.to_bytes(8, 'big') + len(reply).to_bytes(4, 'big') + reply)\n"
+        "except OSError:\n"
+        "    pass\n"
+        "def add(a, b): return a - b</answer>"  # Wrong
+    )
+    wrong = "<answer>def add(a, b): return a - b</answer>"
+    good = "<answer>def add(a, b): return a + b</answer>"
+    test = ["def check(candidate):\n    assert candidate(2, 3) == 5"]
+    
+    # One completion per call, so all run on the same pooled worker when it survives
+    pooled = fastrlrewards.RewardEvaluator(persistent_workers=True)
+    for completion, expected in [(forger, 0.0), (wrong, 0.0), (good, 1.0)]:
+        assert pooled.execution_reward([completion], test=test, entry_point=["add"]) == [expected]
+    print("✓ test_persistent_workers_reject_forged_replies passed")
+
+def test_persistent_workers_timeout():
+    """Pooled workers must give up on programs that hang, even if the worker is stopped"""
+    test = ["def check(candidate):\n    assert candidate(2, 3) == 5"]
+    hangs = [
+        "<answer>def add(a, b):\n    while True:\n        pass</answer>",
+        # Stops the worker itself, so only the host-side deadline can end the wait
+        "<answer>import os, signal\nos.kill(os.getppid(), signal.SIGSTOP)\ndef add(a, b): return a + b</answer>",
+    ]
+    
+    pooled = fastrlrewards.RewardEvaluator(timeout_seconds=2, cpu_time_limit=2, persistent_workers=True)
+    for completion in hangs:
+        start = time.time()
+        assert pooled.execution_reward([completion], test=test, entry_point=["add"]) == [0.0]
+        assert time.time() - start < 15, "Pooled evaluation did not time out"
+    
+    # The pool replaces the discarded worker
+    good = "<answer>def add(a, b): return a + b</answer>"
+    assert pooled.execution_reward([good], test=test, entry_point=["add"]) == [1.0]
+    print("✓ test_persistent_workers_timeout passed")
+
 def test_multiple_evaluators():
     """Test that multiple evaluator instances work correctly"""
     eval1 = fastrlrewards.RewardEvaluator(timeout_seconds=5)
@@ -105,5 +267,13 @@ if __name__ == "__main__":
     test_execution_reward_function()
     test_evaluator_class()
     test_trl_dict_format()
+    test_execution_reward_stream()
+    test_execution_reward_interned()
+    test_execution_reward_dict_batch()
+    test_execution_reward_mask()
+    test_persistent_workers_match_one_shot()
+    test_persistent_workers_isolate_programs()
+    test_persistent_workers_reject_forged_replies()
+    test_persistent_workers_timeout()
     test_multiple_evaluators()
     print("\n✅ All tests passed!\n")
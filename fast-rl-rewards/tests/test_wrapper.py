@@ -1,39 +1,66 @@
 import fastrlrewards 
+import logging
 import re 
-from datasets import load_dataset 
+import time
+from concurrent.futures import ProcessPoolExecutor
+from coder1_dataset import get_filtered_coder1, has_tests, sample_rows
+
+log = logging.getLogger(__name__)
+
+# Patterns compiled once at import instead of per call/line
+_ASSERT = re.compile(r'(\s*)(assert\s+.+)')
+_DEF_CHECK = re.compile(r'def\s+check\s*\(')
 
 # Python reference implementation 
 def wrap_tests_for_complete_execution_python(test_code: str, entry_point: str) -> str:
     """Python reference implementation"""
-    assert_pattern = r'(\s*)(assert\s+.+)'
-    assertions = re.findall(assert_pattern, test_code)
+    # Literal prefilter (C substring search) before the regex; most misses stop here
+    if 'assert' not in test_code:
+        return test_code
     
-    if not assertions:
+    if not _ASSERT.search(test_code):
         return test_code
     
     lines = test_code.split('\n')
     wrapped_lines = []
     in_check_function = False
     check_function_indent = ""
+    # indent -> (try, append True, except, append False) lines; asserts in a test
+    # share one or two indents, so each template is formatted once per call
+    try_blocks = {}
     
     for line in lines:
-        if re.match(r'def\s+check\s*\(', line):
+        if _DEF_CHECK.match(line):
             in_check_function = True
-            check_function_indent = re.match(r'(\s*)', line).group(1)
+            check_function_indent = line[:len(line) - len(line.lstrip())]
             wrapped_lines.append(line)
             wrapped_lines.append(f"{check_function_indent}    _results = []")
             continue
         
-        assert_match = re.match(r'(\s*)(assert\s+.+)', line)
+        assert_match = _ASSERT.match(line)
         if assert_match and in_check_function:
-            indent = assert_match.group(1)
-            assertion = assert_match.group(2)
+            # Match is anchored and `.+` runs to the end of the line, so the groups
+            # are plain slices around the start of group 2
+            indent = line[:assert_match.start(2)]
+            assertion = line[assert_match.start(2):]
             
-            wrapped_lines.append(f"{indent}try:")
-            wrapped_lines.append(f"{indent}    {assertion}")
-            wrapped_lines.append(f"{indent}    _results.append(True)")
-            wrapped_lines.append(f"{indent}except:")
-            wrapped_lines.append(f"{indent}    _results.append(False)")
+            block = try_blocks.get(indent)
+            if block is None:
+                block = try_blocks[indent] = (
+                    f"{indent}try:",
+                    f"{indent}    _results.append(True)",
+                    f"{indent}except:",
+                    f"{indent}    _results.append(False)",
+                )
+            indent_try, indent_true, indent_except, indent_false = block
+            
+            wrapped_lines.extend((
+                indent_try,
+                f"{indent}    {assertion}",
+                indent_true,
+                indent_except,
+                indent_false,
+            ))
             continue
         
         if in_check_function:
@@ -62,37 +89,64 @@ def wrap_tests_for_complete_execution_python(test_code: str, entry_point: str) -
     
     return '\n'.join(wrapped_lines)
 
-def test_with_dataset(num_samples=100, show_failures_only=True, verbose=False):
+def check_one(args):
+    """
+    Compare Python and Rust wrapping for one (idx, test_code, entry_point) sample
+    
+    Module-level so it can be shipped to ProcessPoolExecutor workers. Returns
+    (idx, None) on match, otherwise (idx, failure details).
+    """
+    idx, test_code, entry_point = args
+    try:
+        python_output = wrap_tests_for_complete_execution_python(test_code, entry_point)
+        
+        # Compare inside Rust; the Rust output is only copied into Python
+        # when it has to be shown for a mismatch
+        if fastrlrewards.wrapped_tests_match(test_code, entry_point, python_output):
+            return idx, None
+        
+        rust_output = fastrlrewards.wrap_tests_for_complete_execution(test_code, entry_point)
+        return idx, {
+            'idx': idx,
+            'test_code': test_code,
+            'entry_point': entry_point,
+            'python_output': python_output,
+            'rust_output': rust_output
+        }
+    
+    except Exception as e:
+        return idx, {
+            'idx': idx,
+            'test_code': test_code,
+            'entry_point': entry_point,
+            'error': str(e)
+        }
+
+def test_with_dataset(num_samples=100, show_failures_only=True, verbose=False, num_workers=None):
     """
     Test wrapping function with real Code-R1 dataset
     
+    Samples are checked in a process pool (the Python reference holds the GIL),
+    results are consumed in order.
+    
     Args:
         num_samples: Number of samples to test (None for all)
         show_failures_only: Only print details for failures
         verbose: Show detailed output for each test
+        num_workers: Worker processes (None for os.cpu_count())
     """
     print("\n" + "="*80)
     print("TESTING WITH CODE-R1 DATASET")
     print("="*80 + "\n")
     
-    # Load dataset
-    print("Loading Code-R1 dataset...")
-    dataset = load_dataset("ganler/code-r1-12k", split="train")
-    print(f"Loaded {len(dataset)} problems")
-    
-    # Filter valid samples
-    print("\nFiltering samples with valid tests...")
-    valid_dataset = dataset.filter(
-        lambda x: x['test'] is not None 
-        and x['test'] != 'null' 
-        and x['entry_point'] is not None
-        and x['entry_point'] != 'null'
-    )
+    # Load dataset and filter valid samples (cached on disk after the first run)
+    print("Loading Code-R1 samples with valid tests...")
+    valid_dataset = get_filtered_coder1(has_tests)
     print(f"Valid samples: {len(valid_dataset)}")
     
     # Sample if needed
     if num_samples and num_samples < len(valid_dataset):
-        test_dataset = valid_dataset.shuffle(seed=42).select(range(num_samples))
+        test_dataset = sample_rows(valid_dataset, num_samples, seed=42)
         print(f"Testing with {num_samples} random samples\n")
     else:
         test_dataset = valid_dataset
@@ -104,46 +158,33 @@ def test_with_dataset(num_samples=100, show_failures_only=True, verbose=False):
     failures = []
     
     print("Running tests...")
-    for idx, sample in enumerate(test_dataset):
-        test_code = sample['test']
-        entry_point = sample['entry_point']
-        
-        # Run both implementations
-        try:
-            python_output = wrap_tests_for_complete_execution_python(test_code, entry_point)
-            rust_output = fastrlrewards.wrap_tests_for_complete_execution(test_code, entry_point)
-            
-            # Compare
-            if python_output == rust_output:
+    last_progress = time.monotonic()
+    samples = (
+        (idx, sample['test'], sample['entry_point'])
+        for idx, sample in enumerate(test_dataset)
+    )
+    with ProcessPoolExecutor(max_workers=num_workers) as executor:
+        for idx, failure in executor.map(check_one, samples, chunksize=64):
+            # Per-sample lines go through logging (lazy formatting, off unless
+            # DEBUG is enabled) so stdout flushing cannot dominate large runs
+            if failure is None:
                 passed += 1
                 if verbose and not show_failures_only:
-                    print(f"✓ Sample {idx}: PASS")
+                    log.debug("✓ Sample %d: PASS", idx)
             else:
                 failed += 1
-                failures.append({
-                    'idx': idx,
-                    'test_code': test_code,
-                    'entry_point': entry_point,
-                    'python_output': python_output,
-                    'rust_output': rust_output
-                })
+                failures.append(failure)
                 if show_failures_only or verbose:
-                    print(f"✗ Sample {idx}: FAIL")
-        
-        except Exception as e:
-            failed += 1
-            failures.append({
-                'idx': idx,
-                'test_code': test_code,
-                'entry_point': entry_point,
-                'error': str(e)
-            })
-            if show_failures_only or verbose:
-                print(f"✗ Sample {idx}: ERROR - {e}")
-        
-        # Progress indicator
-        if (idx + 1) % 10 == 0:
-            print(f"  Progress: {idx + 1}/{len(test_dataset)} ({passed} passed, {failed} failed)")
+                    if 'error' in failure:
+                        log.debug("✗ Sample %d: ERROR - %s", idx, failure['error'])
+                    else:
+                        log.debug("✗ Sample %d: FAIL", idx)
+            
+            # Progress indicator, at most once per second
+            now = time.monotonic()
+            if now - last_progress > 1.0:
+                print(f"  Progress: {idx + 1}/{len(test_dataset)} ({passed} passed, {failed} failed)")
+                last_progress = now
     
     # Print summary
     print("\n" + "="*80)
@@ -208,4 +249,6 @@ def test_with_dataset(num_samples=100, show_failures_only=True, verbose=False):
 
 
 if __name__ == "__main__":
+    logging.basicConfig(format="%(message)s")
+    log.setLevel(logging.DEBUG)
     success = test_with_dataset(num_samples=100)
\ No newline at end of file